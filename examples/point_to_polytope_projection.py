@@ -4,12 +4,12 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright 2021 Stéphane Caron
 
-import pylab
-from numpy import arange, array, cos, pi, sin
+from numpy import arange, array, cos, pi, sin, stack
 
 import pypoman
 
-vertices = [(cos(theta), sin(theta)) for theta in arange(0, 2 * pi, pi / 6)]
+theta = arange(0, 2 * pi, pi / 6)
+vertices = stack([cos(theta), sin(theta)], axis=1)
 A, b = pypoman.compute_polytope_halfspaces(vertices)
 
 point = array([2.1, 1.9])
@@ -17,6 +17,8 @@ proj = pypoman.project_point_to_polytope(point, (A, b), qpsolver="cvxopt")
 
 
 if __name__ == "__main__":  # plot projected polytope
+    import pylab
+
     pylab.ion()
     pylab.figure()
     pylab.gca().set_aspect("equal")
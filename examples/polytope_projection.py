@@ -5,8 +5,6 @@
 # Copyright 2016 Quang-Cuong Pham
 # Copyright 2017-2020 Stéphane Caron
 
-import pylab
-
 from numpy import array, eye, ones, vstack, zeros
 
 import pypoman
@@ -34,6 +32,8 @@ proj = (E, f)  # proj(x) = E * x + f
 vertices = pypoman.project_polytope(proj, ineq, eq, method='bretl')
 
 if __name__ == "__main__":   # plot projected polytope
+    import pylab
+
     pylab.ion()
     pylab.figure()
     pypoman.plot_polygon(vertices, resize=True)
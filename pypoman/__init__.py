@@ -7,21 +7,28 @@
 """Python module for polyhedral geometry."""
 
 from .duality import (
+    PolytopeEvaluable,
     compute_cone_face_matrix,
     compute_polytope_halfspaces,
     compute_polytope_vertices,
     convex_hull,
+    convex_hull_batch,
 )
 from .intersection import (
+    PolygonCylinder,
     intersect_line_cylinder,
     intersect_line_polygon,
+    intersect_lines_cylinder,
     intersect_polygons,
 )
-from .lp import solve_lp
+from .lp import solve_lp, solve_lp_batch
+from .misc import clear_cache, set_cache_size
 from .polygon import compute_polygon_hull, plot_polygon
 from .polyhedron import compute_chebyshev_center
 from .projection import (
+    PolytopeProjector,
     project_point_to_polytope,
+    project_points_to_polytope,
     project_polytope,
     project_polytope_bretl,
 )
@@ -29,18 +36,27 @@ from .projection import (
 __version__ = "1.2.0"
 
 __all__ = [
+    "PolygonCylinder",
+    "PolytopeEvaluable",
+    "PolytopeProjector",
+    "clear_cache",
     "compute_chebyshev_center",
     "compute_cone_face_matrix",
     "compute_polygon_hull",
     "compute_polytope_halfspaces",
     "compute_polytope_vertices",
     "convex_hull",
+    "convex_hull_batch",
     "intersect_line_cylinder",
     "intersect_line_polygon",
+    "intersect_lines_cylinder",
     "intersect_polygons",
     "plot_polygon",
     "project_polytope",
     "project_polytope_bretl",
     "project_point_to_polytope",
+    "project_points_to_polytope",
+    "set_cache_size",
     "solve_lp",
+    "solve_lp_batch",
 ]
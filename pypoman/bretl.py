@@ -7,17 +7,237 @@
 
 """Iterative projection algorithm by [Bretl08]_."""
 
+import math
 from typing import Any, List, Optional, Tuple, Union
 
+import cvxopt
 import numpy as np
 from numpy.random import random
-from scipy.linalg import norm
+from scipy import sparse
 
-from .lp import GLPK_IF_AVAILABLE, solve_lp
+from .lp import GLPK_IF_AVAILABLE, cvxmat, cvxopt_lp, solve_lp
+
+
+class DirectionOptimizer:
+    r"""Maximize the projected coordinates of an LP in given directions.
+
+    The LP constraints are converted to the solver format once at
+    construction, so that successive optimizations only overwrite the last two
+    coefficients of the cost vector and call the CVXOPT solver directly.
+
+    As the cost vector is modified in place, an optimizer should not be
+    shared between threads. Running several optimizers in parallel threads
+    would not speed things up either, as the CVXOPT interface to GLPK holds
+    the global interpreter lock while solving.
+
+    Attributes
+    ----------
+    lp :
+        Tuple `(q, G, h, A, b)` defining the LP, converted to CVXOPT matrices,
+        or to NumPy and SciPy sparse arrays for HiGHS.
+    planar_halfspaces :
+        Pair `(B, c)` of the inequality constraints :math:`B z \leq c` of the
+        LP that only involve its two last coordinates :math:`z`.
+    solver :
+        Backend LP solver to call.
+    """
+
+    lp: Tuple[Any, Any, Any, Any, Any]
+    planar_halfspaces: Tuple[np.ndarray, np.ndarray]
+    solver: Optional[str]
+
+    def __init__(
+        self,
+        lp: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+        solver: Optional[str] = GLPK_IF_AVAILABLE,
+        max_density: float = 0.0,
+    ):
+        """
+        Prepare the LP for repeated optimizations.
+
+        Parameters
+        ----------
+        lp :
+            Tuple `(q, G, h, A, b)` defining the LP. See
+            :func:`pypoman.lp.solve_lp` for details.
+        solver :
+            Backend LP solver to call. Set to "highs" to keep the LP as NumPy
+            and SciPy sparse arrays solved by HiGHS, which is slower than GLPK
+            on small LPs but faster on large ones.
+        max_density :
+            Constraint matrices whose ratio of nonzero coefficients is at most
+            this value are stored as sparse CVXOPT matrices. See
+            :func:`pypoman.lp.cvxmat`.
+        """
+        lp_q, lp_G, lp_h, lp_A, lp_b = lp
+        if isinstance(lp_G, cvxopt.spmatrix):
+            lp_G = cvxopt.matrix(lp_G)  # dense copy to find planar rows
+        G = np.array(lp_G, dtype=np.float64)
+        h = np.array(lp_h, dtype=np.float64).flatten()
+        if solver == "highs":
+            q = np.array(lp_q, dtype=np.float64).flatten()
+            if lp_A is not None:
+                A = np.array(cvxopt.matrix(lp_A), dtype=np.float64)
+                lp_A = sparse.csc_matrix(A)
+                lp_b = np.array(lp_b, dtype=np.float64).flatten()
+            self.lp = (q, sparse.csc_matrix(G), h, lp_A, lp_b)
+        else:
+            if lp_A is not None:
+                lp_A, lp_b = cvxmat(lp_A, max_density), cvxmat(lp_b)
+            lp_G = cvxmat(G, max_density)
+            self.lp = (cvxmat(lp_q), lp_G, cvxmat(h), lp_A, lp_b)
+        planar = ~G[:, :-2].any(axis=1)
+        planar &= G[:, -2:].any(axis=1)  # skip all-zero rows like 0 <= 0
+        self.__planar = planar
+        self.planar_halfspaces = (G[planar, -2:], h[planar])
+        self.solver = solver
+
+    def update_vectors(
+        self, h: Optional[np.ndarray] = None, b: Optional[np.ndarray] = None
+    ) -> None:
+        """Overwrite constraint vectors of the LP in place.
+
+        Parameters
+        ----------
+        h :
+            New linear inequality constraint vector, if any.
+        b :
+            New linear equality constraint vector, if any.
+
+        Raises
+        ------
+        ValueError
+            If `b` is given but the LP has no equality constraints.
+        """
+        if b is not None and self.lp[4] is None:
+            raise ValueError("LP has no equality constraints to update")
+        if h is not None:
+            h = np.asarray(h, dtype=np.float64).flatten()
+            np.asarray(self.lp[2]).reshape(-1)[:] = h
+            B = self.planar_halfspaces[0]
+            self.planar_halfspaces = (B, h[self.__planar])
+        if b is not None:
+            np.asarray(self.lp[4]).reshape(-1)[:] = b
+
+    def on_planar_boundary(
+        self, starts: np.ndarray, ends: np.ndarray
+    ) -> np.ndarray:
+        """Check which edges lie on the boundary of a planar halfspace.
+
+        An edge whose two end points lie on the boundary of one of the
+        :attr:`planar_halfspaces` is an edge of the projected polygon, as the
+        latter is contained in the halfspace. Optimizing in its normal
+        direction would return a point on the edge.
+
+        Parameters
+        ----------
+        starts :
+            Array of shape (N, 2) of edge start points.
+        ends :
+            Array of shape (N, 2) of edge end points.
+
+        Returns
+        -------
+        :
+            Boolean array of shape (N,), true for edges that lie on the
+            boundary of a planar halfspace.
+        """
+        B, c = self.planar_halfspaces
+        norms = np.linalg.norm(B, axis=1)
+        tol = 1e-6 * (1.0 + np.abs(c) / norms)  # relative to boundary offset
+        on_start = (starts @ B.T - c) / norms > -tol
+        on_end = (ends @ B.T - c) / norms > -tol
+        return (on_start & on_end).any(axis=1)
+
+    def optimize(
+        self, vdir: Union[Tuple[float, float], np.ndarray]
+    ) -> np.ndarray:
+        """Optimize in one direction.
+
+        Parameters
+        ----------
+        vdir :
+            Direction (2D vector) in which the optimization is performed.
+
+        Returns
+        -------
+        :
+            Vector ``z`` representing the maximum vertex of the polygon in the
+            direction `vdir`.
+
+        Raises
+        ------
+        ValueError
+            If the LP is not feasible.
+        """
+        return np.array(self.optimize_xy(vdir[0], vdir[1]))
+
+    def optimize_xy(self, vx: float, vy: float) -> Tuple[float, float]:
+        """Optimize in one direction given by its coordinates.
+
+        Parameters
+        ----------
+        vx :
+            First coordinate of the direction.
+        vy :
+            Second coordinate of the direction.
+
+        Returns
+        -------
+        :
+            Coordinates of the maximum vertex of the polygon in the direction
+            ``(vx, vy)``.
+
+        Raises
+        ------
+        ValueError
+            If the LP is not feasible.
+        """
+        lp_q = self.lp[0]
+        lp_q[-2] = -vx
+        lp_q[-1] = -vy
+        if self.solver == "highs":
+            z = solve_lp(*self.lp, solver="highs")
+            return float(z[-2]), float(z[-1])
+        status, x = cvxopt_lp(*self.lp, solver=self.solver)
+        if "optimal" not in status or x is None:
+            raise ValueError("LP optimum not found: %s" % status)
+        return float(x[-2]), float(x[-1])
+
+    def optimize_many(self, directions: np.ndarray) -> np.ndarray:
+        """Optimize in several directions.
+
+        Parameters
+        ----------
+        directions :
+            Array of shape (N, 2) whose rows are the directions in which the
+            optimizations are performed.
+
+        Returns
+        -------
+        :
+            Array of shape (N, 2) whose i-th row is the maximum vertex of the
+            polygon in the i-th direction, or NaN if the LP could not be
+            solved in this direction.
+        """
+        optima = np.full((directions.shape[0], 2), np.nan)
+        for i, (vx, vy) in enumerate(directions.tolist()):
+            try:
+                optima[i] = self.optimize_xy(vx, vy)
+            except ValueError:
+                continue
+        return optima
 
 
 class Vertex:
-    """Vertex of the projected polygon, with a pointer to its successor."""
+    """Vertex of the projected polygon, with a pointer to its successor.
+
+    Vertices are created by the hundreds during polygon expansion, so they
+    have fixed slots and store their coordinates as Python floats, which are
+    cheaper than NumPy scalars for the scalar arithmetic done on them.
+    """
+
+    __slots__ = ("expanded", "next", "x", "y")
 
     expanded: bool
     next: Optional[Any]
@@ -33,8 +253,8 @@ class Vertex:
         p :
             2D coordinates of the vertex.
         """
-        self.x = p[0]
-        self.y = p[1]
+        self.x = float(p[0])
+        self.y = float(p[1])
         self.next = None
         self.expanded = False
 
@@ -55,26 +275,38 @@ class Vertex:
         v2 = self.next
         if v2 is None:
             raise ValueError("cannot expand vertex as it has no successor")
-        v = np.array(
-            [v2.y - v1.y, v1.x - v2.x]
-        )  # orthogonal direction to edge
-        v /= norm(v)
+        ax, ay = v2.y - v1.y, v1.x - v2.x  # orthogonal direction to edge
+        length = math.hypot(ax, ay)
         try:
-            z = optimize_direction(v, lp)
+            z = optimize_direction((ax / length, ay / length), lp)
         except ValueError:
             self.expanded = True
             return None
-        xopt: float = z[0]
-        yopt: float = z[1]
-        if (
-            abs(
-                np.cross(
-                    [xopt - v1.x, yopt - v1.y, 0],
-                    [v1.x - v2.x, v1.y - v2.y, 0],
-                )[2]
-            )
-            < 1e-4
-        ):
+        return self.insert_next(z)
+
+    def insert_next(self, z: np.ndarray):
+        """
+        Insert a new vertex between the vertex and its successor.
+
+        Parameters
+        ----------
+        z :
+            Maximum vertex of the polygon in the direction orthogonal to the
+            edge from the vertex to its successor.
+
+        Returns
+        -------
+        :
+            New vertex, or ``None`` if `z` is on the edge, in which case the
+            vertex is marked as expanded.
+        """
+        v1 = self
+        v2 = self.next
+        if v2 is None:
+            raise ValueError("cannot expand vertex as it has no successor")
+        xopt, yopt = float(z[0]), float(z[1])
+        cross = (xopt - v1.x) * (v1.y - v2.y) - (yopt - v1.y) * (v1.x - v2.x)
+        if abs(cross) < 1e-4:  # z is on the edge
             self.expanded = True
             return None
         vnew = Vertex([xopt, yopt])
@@ -116,15 +348,16 @@ class Polygon:
         :
             True if and only if all vertices have been expanded.
         """
-        for v in self.vertices:
-            if not v.expanded:
-                return False
-        return True
+        return all(v.expanded for v in self.vertices)
 
     def iter_expand(
         self,
-        lp: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+        lp: Union[
+            DirectionOptimizer,
+            Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+        ],
         max_iter: int,
+        solver: Optional[str] = GLPK_IF_AVAILABLE,
     ) -> None:
         """Extend polygon until the termination condition is reached.
 
@@ -134,26 +367,59 @@ class Polygon:
         Parameters
         ----------
         lp :
-            Tuple `(q, G, h, A, b)` defining the linear program. See
-            :func:`pypoman.lp.solve_lp` for details.
+            Tuple `(q, G, h, A, b)` defining the linear program, see
+            :func:`pypoman.lp.solve_lp` for details, or direction optimizer
+            already prepared from this tuple.
         max_iter :
             Maximum number of iterations.
+        solver :
+            Backend LP solver to call, when `lp` is a tuple.
+
+        Notes
+        -----
+        Vertices are expanded by rounds: all edges that are unexpanded at the
+        beginning of a round are sent to the LP solver in a single batch, then
+        the new vertices are spliced into the polygon. Only the two edges
+        created by each splice are queued for the next round, so that the
+        vertex list is scanned once per call rather than once per round.
         """
+        optimizer = (
+            lp
+            if isinstance(lp, DirectionOptimizer)
+            else DirectionOptimizer(lp, solver)
+        )
         nb_iter = 0
-        v = self.vertices[0]
-        while not self.all_expanded() and nb_iter < max_iter:
-            if v.expanded:
-                if v.next is None:
-                    raise ValueError(
-                        "Invalid expanded vertex with no successor"
-                    )
-                v = v.next
-                continue
-            vnew = v.expand(lp)
-            if vnew is None:
-                continue
-            self.vertices.append(vnew)
-            nb_iter += 1
+        pending = [v for v in self.vertices if not v.expanded]
+        while pending and nb_iter < max_iter:
+            batch = pending[: max_iter - nb_iter]
+            pending = pending[len(batch) :]
+            successors = [v.next for v in batch if v.next is not None]
+            if len(successors) < len(batch):
+                raise ValueError("Invalid vertex with no successor")
+            starts = np.array([[v.x, v.y] for v in batch])
+            ends = np.array([[w.x, w.y] for w in successors])
+            on_boundary = optimizer.on_planar_boundary(starts, ends)
+            for i in np.flatnonzero(on_boundary):
+                batch[i].expanded = True  # no need to call the LP solver
+            batch = [v for v, on in zip(batch, on_boundary) if not on]
+            starts, ends = starts[~on_boundary], ends[~on_boundary]
+            directions = np.column_stack(
+                [ends[:, 1] - starts[:, 1], starts[:, 0] - ends[:, 0]]
+            )  # orthogonal directions to edges
+            directions /= np.linalg.norm(directions, axis=1).reshape((-1, 1))
+            optima = optimizer.optimize_many(directions)
+            new_vertices = []
+            for v, z in zip(batch, optima.tolist()):
+                if math.isnan(z[0]):  # LP failed in this direction
+                    v.expanded = True
+                    continue
+                vnew = v.insert_next(z)
+                if vnew is None:
+                    continue
+                new_vertices.append(vnew)
+                pending.extend((v, vnew))  # both new edges are unexpanded
+            self.vertices.extend(new_vertices)
+            nb_iter += len(new_vertices)
 
     def sort_vertices(self):
         """Export vertices starting from the leftmost one and going clockwise.
@@ -162,24 +428,19 @@ class Polygon:
         ----
         Assumes all vertices are on the positive halfplane.
         """
-        minsd = 1e10
-        ibottom = 0
-        for i in range(len(self.vertices)):
-            vertex = self.vertices[i]
-            next_vertex = vertex.next
-            if next_vertex is None:
-                raise ValueError("Invalid expanded vertex with no successor")
-            if (vertex.y + next_vertex.y) < minsd:
-                ibottom = i
-                minsd = vertex.y + next_vertex.y
-        for vertex in self.vertices:
-            vertex.checked = False
-        vcur = self.vertices[ibottom]
+        if any(vertex.next is None for vertex in self.vertices):
+            raise ValueError("Invalid expanded vertex with no successor")
+        edge_heights = np.array(
+            [vertex.y + vertex.next.y for vertex in self.vertices]
+        )
+        vbottom = self.vertices[int(np.argmin(edge_heights))]
+        vcur = vbottom
         newvertices = []
-        while not vcur.checked:
-            vcur.checked = True
+        while True:
             newvertices.append(vcur)
             vcur = vcur.next
+            if vcur is vbottom:
+                break
         newvertices.reverse()
         vfirst = newvertices.pop(-1)
         newvertices.insert(0, vfirst)
@@ -198,18 +459,22 @@ class Polygon:
         :
             List of vertices.
         """
+        coords = np.array([[v.x, v.y] for v in self.vertices[:-1]])
+        gaps = np.sum(np.diff(coords, axis=0) ** 2, axis=1)
+        if np.all(gaps > min_dist**2):  # no vertex is close to its predecessor
+            return list(self.vertices)
         vertices: List[Vertex] = [self.vertices[0]]
         for i in range(1, len(self.vertices) - 1):
             vcur = self.vertices[i]
             vlast = vertices[-1]
-            if norm([vcur.x - vlast.x, vcur.y - vlast.y]) > min_dist:
+            if math.hypot(vcur.x - vlast.x, vcur.y - vlast.y) > min_dist:
                 vertices.append(vcur)
         vertices.append(self.vertices[-1])  # always add last vertex
         return vertices
 
 
 def optimize_direction(
-    vdir: np.ndarray,
+    vdir: Union[Tuple[float, float], np.ndarray],
     lp: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray],
     solver: Optional[str] = GLPK_IF_AVAILABLE,
 ) -> np.ndarray:
@@ -218,10 +483,10 @@ def optimize_direction(
     Parameters
     ----------
     vdir :
-        Direction (3D vector) in which the optimization is performed.
+        Direction (2D vector) in which the optimization is performed.
     lp :
         Tuple `(q, G, h, A, b)` defining the LP. See
-        :func:`pypoman.lp..solve_lp` for details.
+        :func:`pypoman.lp.solve_lp` for details.
     solver :
         Backend LP solver to call.
 
@@ -231,11 +496,35 @@ def optimize_direction(
         Vector ``z`` representing the maximum vertex of the polygon in the
         direction `vdir`.
     """
-    lp_q, lp_Gextended, lp_hextended, lp_A, lp_b = lp
-    lp_q[-2] = -vdir[0]
-    lp_q[-1] = -vdir[1]
-    x = solve_lp(lp_q, lp_Gextended, lp_hextended, lp_A, lp_b, solver=solver)
-    return x[-2:]
+    return DirectionOptimizer(lp, solver).optimize(vdir)
+
+
+def optimize_directions(
+    directions: np.ndarray,
+    lp: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    solver: Optional[str] = GLPK_IF_AVAILABLE,
+) -> np.ndarray:
+    """Optimize in several directions with the same LP constraints.
+
+    Parameters
+    ----------
+    directions :
+        Array of shape (N, 2) whose rows are the directions in which the
+        optimizations are performed.
+    lp :
+        Tuple `(q, G, h, A, b)` defining the LP. See
+        :func:`pypoman.lp.solve_lp` for details.
+    solver :
+        Backend LP solver to call.
+
+    Returns
+    -------
+    :
+        Array of shape (N, 2) whose i-th row is the maximum vertex of the
+        polygon in the i-th direction, or NaN if the LP could not be solved in
+        this direction.
+    """
+    return DirectionOptimizer(lp, solver).optimize_many(directions)
 
 
 def optimize_angle(
@@ -251,7 +540,7 @@ def optimize_angle(
         Angle of the direction in which the optimization is performed.
     lp :
         Tuple `(q, G, h, A, b)` defining the LP. See
-        :func:`pypoman.lp..solve_lp` for details.
+        :func:`pypoman.lp.solve_lp` for details.
     solver :
         Backend LP solver to call.
 
@@ -259,15 +548,46 @@ def optimize_angle(
     -------
     :
         Vector ``z`` representing the maximum vertex of the polygon in the
-        direction `vdir`.
+        direction of angle `theta`.
     """
-    d = np.array([np.cos(theta), np.sin(theta)])
-    z = optimize_direction(d, lp, solver=solver)
-    return z
+    return optimize_direction(
+        (math.cos(theta), math.sin(theta)), lp, solver=solver
+    )
+
+
+def __select_init_vertices(points: np.ndarray) -> List[np.ndarray]:
+    """Select the first three distinct and non-collinear points of a list.
+
+    Parameters
+    ----------
+    points :
+        Array of shape (N, 2) of points, sorted by angle of the direction in
+        which they were found.
+
+    Returns
+    -------
+    :
+        List of at most three points, in the same order as `points`.
+    """
+    selected: List[np.ndarray] = []
+    for z in points:
+        if any((z - z0) @ (z - z0) < 1e-10 for z0 in selected):
+            continue
+        if len(selected) == 2:
+            (x0, y0), (x1, y1) = selected
+            if abs((x1 - x0) * (z[1] - y0) - (y1 - y0) * (z[0] - x0)) < 1e-10:
+                continue
+        selected.append(z)
+        if len(selected) == 3:
+            break
+    return selected
 
 
 def compute_polygon(
-    lp: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    lp: Union[
+        DirectionOptimizer,
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    ],
     max_iter: int = 1000,
     solver: Optional[str] = GLPK_IF_AVAILABLE,
     init_angle: Optional[float] = None,
@@ -277,12 +597,13 @@ def compute_polygon(
     Parameters
     ----------
     lp :
-        Tuple `(q, G, h, A, b)` defining the linear program. See
-        :func:`pypoman.lp.solve_lp` for details.
+        Tuple `(q, G, h, A, b)` defining the linear program, see
+        :func:`pypoman.lp.solve_lp` for details, or direction optimizer
+        already prepared from this tuple.
     max_iter :
         Maximum number of calls to the LP solver.
     solver :
-        Name of backend LP solver.
+        Name of backend LP solver, when `lp` is a tuple.
     init_angle :
         Angle in [rad] giving the direction of the initial ray cast.
 
@@ -290,24 +611,41 @@ def compute_polygon(
     -------
     :
         Output polygon.
+
+    Notes
+    -----
+    The initial triangle is found by casting six evenly-spaced rays from
+    `init_angle`, then bisecting their angular intervals until three distinct
+    vertices are found.
     """
+    optimizer = (
+        lp
+        if isinstance(lp, DirectionOptimizer)
+        else DirectionOptimizer(lp, solver)
+    )
     theta = init_angle if init_angle is not None else np.pi * random()
-    init_vertices = [optimize_angle(theta, lp, solver)]
-    step = 2.0 * np.pi / 3.0
-    while len(init_vertices) < 3 and max_iter >= 0:
-        theta += step
-        if theta >= 2.0 * np.pi:
-            step *= 0.25 + 0.5 * random()
-            theta += step - 2.0 * np.pi
-        z = optimize_angle(theta, lp, solver)
-        if all([norm(z - z0) > 1e-5 for z0 in init_vertices]):
-            init_vertices.append(z)
-        max_iter -= 1
+    step = np.pi / 3.0
+    new_angles = theta + step * np.arange(6)
+    angles, optima = np.empty(0), np.empty((0, 2))
+    while True:
+        new_optima = optimizer.optimize_many(
+            np.column_stack([np.cos(new_angles), np.sin(new_angles)])
+        )
+        if np.isnan(new_optima).any():
+            raise ValueError("problem is not linearly feasible")
+        angles = np.concatenate([angles, new_angles])
+        optima = np.vstack([optima, new_optima])
+        max_iter -= new_angles.shape[0]
+        init_vertices = __select_init_vertices(optima[np.argsort(angles)])
+        if len(init_vertices) == 3 or max_iter < 0:
+            break
+        new_angles = angles + 0.5 * step  # bisect all angular intervals
+        step *= 0.5
     if len(init_vertices) < 3:
         raise ValueError("problem is not linearly feasible")
     v0 = Vertex(init_vertices[0])
     v1 = Vertex(init_vertices[1])
     v2 = Vertex(init_vertices[2])
     polygon = Polygon(v0, v1, v2)
-    polygon.iter_expand(lp, max_iter)
+    polygon.iter_expand(optimizer, max_iter)
     return polygon
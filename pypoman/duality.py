@@ -6,15 +6,20 @@
 
 """Functions to switch between halfspace and vertex representations."""
 
-from typing import List, Tuple, Union
+import itertools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple, Union
 
 import cdd
 import numpy as np
-from scipy.spatial import ConvexHull
+from scipy.spatial import ConvexHull, HalfspaceIntersection, QhullError
 
-from .misc import norm
+from .misc import array_lru_cache, stack_vertices
+from .polyhedron import compute_chebyshev_center
 
 
+@array_lru_cache
 def compute_cone_face_matrix(S: np.ndarray) -> np.ndarray:
     r"""Compute the face matrix of a polyhedral cone from its span matrix.
 
@@ -36,27 +41,26 @@ def compute_cone_face_matrix(S: np.ndarray) -> np.ndarray:
         ]
     )
     # V-representation: first column is 0 for rays
-    mat = cdd.matrix_from_array(V)  # type: ignore
+    mat = cdd.matrix_from_array(V.tolist())
     mat.rep_type = cdd.RepType.GENERATOR
     P = cdd.polyhedron_from_matrix(mat)
     ineq = cdd.copy_inequalities(P)
-    H = np.array(ineq.array)
+    H = np.array(ineq.array, dtype=np.float64)
     if H.shape == (0,):  # H == []
         return H
-    A = []
-    for i in range(H.shape[0]):
-        # H matrix is [b, -A] for A * x <= b
-        if norm(H[i, 1:]) < 1e-10:
-            continue
-        elif abs(H[i, 0]) > 1e-10:  # b should be zero for a cone
-            raise ValueError("Polyhedron is not a cone")
-        elif i not in ineq.lin_set:
-            A.append(-H[i, 1:])
-    return np.array(A)
+    # H matrix is [b, -A] for A * x <= b
+    sq_norms = np.einsum("ij,ij->i", H[:, 1:], H[:, 1:])
+    nonzero = sq_norms >= 1e-20
+    if np.any(np.abs(H[nonzero, 0]) > 1e-10):  # b should be zero for a cone
+        raise ValueError("Polyhedron is not a cone")
+    nonzero[list(ineq.lin_set)] = False  # skip equality constraints
+    return -H[nonzero, 1:]
 
 
+@array_lru_cache
 def compute_polytope_halfspaces(
     vertices: List[np.ndarray],
+    backend: str = "cdd",
 ) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
     r"""Compute the halfspace representation (H-rep) of a polytope.
 
@@ -72,30 +76,57 @@ def compute_polytope_halfspaces(
     ----------
     vertices :
         List of polytope vertices.
+    backend :
+        Either "cdd" to use the double description method, or "qhull" to
+        read facet equations from the Quickhull algorithm.
 
     Returns
     -------
     :
         Tuple ``(A, b)`` of the halfspace representation, or empty array if it
         is empty.
+
+    Raises
+    ------
+    ValueError
+        If the backend is unknown.
+
+    Notes
+    -----
+    The "qhull" backend is usually faster in low dimension but requires a
+    full-dimensional polytope. Equality constraints are not detected, and
+    rows of the output are unit normals of the facets.
     """
-    V = np.vstack(vertices)
+    V = stack_vertices(vertices)
+    if backend == "qhull":
+        equations = ConvexHull(V).equations  # [A | -b] with A x - b <= 0
+        # simplicial facets of a same face share the same equation
+        _, unique = np.unique(
+            equations.round(decimals=10), axis=0, return_index=True
+        )
+        equations = equations[np.sort(unique)]
+        return (equations[:, :-1], -equations[:, -1])
+    elif backend != "cdd":
+        raise ValueError(f"Unknown backend '{backend}'")
     t = np.ones((V.shape[0], 1))  # first column is 1 for vertices
     tV = np.hstack([t, V])
-    mat = cdd.matrix_from_array(tV)  # type: ignore
+    mat = cdd.matrix_from_array(tV.tolist())
     mat.rep_type = cdd.RepType.GENERATOR
     P = cdd.polyhedron_from_matrix(mat)
-    bA = np.array(cdd.copy_inequalities(P).array)
+    bA = np.array(cdd.copy_inequalities(P).array, dtype=np.float64)
     if bA.shape == (0,):  # bA == []
         return bA
     # the polyhedron is given by b + A x >= 0 where bA = [b|A]
-    b, A = np.array(bA[:, 0]), -np.array(bA[:, 1:])
+    b, A = bA[:, 0], -bA[:, 1:]
     return (A, b)
 
 
 def compute_polytope_vertices(
-    A: np.ndarray, b: np.ndarray
-) -> List[np.ndarray]:
+    A: np.ndarray,
+    b: np.ndarray,
+    row_order: Optional[cdd.RowOrderType] = None,
+    backend: str = "cdd",
+) -> np.ndarray:
     r"""Compute the vertices of a polytope.
 
     The polytope is given in halfspace representation by :math:`A x \leq b`.
@@ -106,11 +137,23 @@ def compute_polytope_vertices(
         Matrix of halfspace representation.
     b :
         Vector of halfspace representation.
+    row_order :
+        Order in which the double description method processes halfspaces,
+        for instance ``cdd.RowOrderType.MAX_CUTOFF``. The default of cdd is
+        used if ``None``.
+    backend :
+        Either "cdd" to use the double description method, or "qhull" to
+        intersect halfspaces around the Chebyshev center with Qhull.
 
     Returns
     -------
     :
-        List of polytope vertices.
+        Array of polytope vertices, one vertex per row.
+
+    Raises
+    ------
+    ValueError
+        If the backend is unknown, or the polyhedron is not a polytope.
 
     Notes
     -----
@@ -119,23 +162,297 @@ def compute_polytope_vertices(
     -A x \leq -b)`. If this is your use case, consider using directly the
     linear set ``lin_set`` of `equality-constraint generatorsin pycddlib
     <https://pycddlib.readthedocs.io/en/latest/matrix.html>`_.
+
+    The size of intermediate vertex sets in the double description method,
+    hence its computation time, depends on the order in which halfspaces
+    are processed. On degenerate or high-dimensional inputs, trying another
+    `row_order` can make a large difference.
+
+    Axis-aligned boxes and simplices are detected beforehand, and their
+    vertices computed directly without the double description method.
+
+    The "qhull" backend is usually faster than cdd on full-dimensional
+    polytopes. It falls back to cdd when the polyhedron has no interior or is
+    unbounded.
     """
-    b = b.reshape((b.shape[0], 1))
-    mat = cdd.matrix_from_array(np.hstack([b, -A]))  # type: ignore
-    mat.rep_type = cdd.RepType.INEQUALITY
-    P = cdd.polyhedron_from_matrix(mat)
-    g = cdd.copy_generators(P)
-    V = np.array(g.array)
-    vertices = []
-    for i in range(V.shape[0]):
-        if V[i, 0] != 1:  # 1 = vertex, 0 = ray
-            raise ValueError("Polyhedron is not a polytope")
-        elif i not in g.lin_set:
-            vertices.append(V[i, 1:])
+    if backend not in ("cdd", "qhull"):
+        raise ValueError(f"Unknown backend '{backend}'")
+    A = np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float).flatten()
+    vertices = __compute_box_vertices(A, b)
+    if vertices is None:
+        vertices = __compute_simplex_vertices(A, b)
+    if vertices is None and backend == "qhull":
+        vertices = __intersect_halfspaces(A, b)
+    if vertices is None:
+        vertices = PolytopeEvaluable(A, b, row_order=row_order).vertices()
     return vertices
 
 
-def convex_hull(points: List[np.ndarray]) -> List[np.ndarray]:
+def __intersect_halfspaces(
+    A: np.ndarray, b: np.ndarray
+) -> Optional[np.ndarray]:
+    r"""Compute the vertices of a polytope by halfspace intersection.
+
+    Parameters
+    ----------
+    A :
+        Matrix of halfspace representation.
+    b :
+        Vector of halfspace representation.
+
+    Returns
+    -------
+    :
+        Array of polytope vertices, or ``None`` if :math:`A x \leq b` has no
+        interior or is unbounded.
+    """
+    try:
+        center = compute_chebyshev_center(A, b)
+    except ValueError:  # empty or unbounded
+        return None
+    norms = np.linalg.norm(A, axis=1)
+    if np.min((b - A.dot(center)) / norms) < 1e-10:  # no interior
+        return None
+    halfspaces = np.hstack([A, -b.reshape((-1, 1))])
+    try:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            V = HalfspaceIntersection(halfspaces, center).intersections
+    except QhullError:  # unbounded along a direction, e.g. a slab
+        return None
+    if not np.all(np.isfinite(V)):  # vertices at infinity
+        return None
+    _, unique = np.unique(V.round(decimals=10), axis=0, return_index=True)
+    return V[np.sort(unique)]
+
+
+def __compute_box_vertices(
+    A: np.ndarray, b: np.ndarray
+) -> Optional[np.ndarray]:
+    r"""Compute the vertices of an axis-aligned box.
+
+    Parameters
+    ----------
+    A :
+        Matrix of halfspace representation.
+    b :
+        Vector of halfspace representation.
+
+    Returns
+    -------
+    :
+        Array of box vertices, or ``None`` if :math:`A x \leq b` is not a
+        full-dimensional axis-aligned box.
+    """
+    nonzero = np.abs(A) > 1e-10
+    if not np.all(nonzero.sum(axis=1) == 1):
+        return None
+    coords = nonzero.argmax(axis=1)  # coordinate bounded by each row
+    coefs = A[np.arange(A.shape[0]), coords]
+    bounds = b / coefs
+    lower = np.full(A.shape[1], -np.inf)
+    upper = np.full(A.shape[1], np.inf)
+    np.maximum.at(lower, coords[coefs < 0], bounds[coefs < 0])
+    np.minimum.at(upper, coords[coefs > 0], bounds[coefs > 0])
+    if not np.all(np.isfinite(upper - lower)):  # unbounded
+        return None
+    elif not np.all(upper - lower > 1e-10):  # empty or flat
+        return None
+    return np.array(list(itertools.product(*zip(lower, upper))))
+
+
+def __compute_simplex_vertices(
+    A: np.ndarray, b: np.ndarray
+) -> Optional[np.ndarray]:
+    r"""Compute the vertices of a simplex.
+
+    Parameters
+    ----------
+    A :
+        Matrix of halfspace representation.
+    b :
+        Vector of halfspace representation.
+
+    Returns
+    -------
+    :
+        Array of simplex vertices, or ``None`` if :math:`A x \leq b` is not a
+        full-dimensional simplex.
+
+    Notes
+    -----
+    When :math:`A` has :math:`k + 1` rows in dimension :math:`k`, each vertex
+    of a simplex saturates all inequalities but one, which it satisfies
+    strictly. Conversely, if all such points exist and satisfy their
+    remaining inequality strictly, the polytope is their convex hull.
+    """
+    m, k = A.shape
+    if m != k + 1:
+        return None
+    vertices = []
+    for i in range(m):
+        rows = np.arange(m) != i
+        try:
+            v = np.linalg.solve(A[rows], b[rows])
+        except np.linalg.LinAlgError:
+            return None
+        if A[i].dot(v) > b[i] - 1e-10:
+            return None
+        vertices.append(v)
+    return np.array(vertices)
+
+
+class PolytopeEvaluable:
+    r"""Polytope in halfspace representation with a cached cdd polyhedron.
+
+    The polytope is given by :math:`A x \leq b`. Its cdd matrix is built
+    once at construction, its cdd polyhedron on the first query, and the
+    results of queries are memoized, so that repeated queries on the same
+    polytope do not pay the conversion to cdd again.
+
+    Attributes
+    ----------
+    A :
+        Matrix of halfspace representation.
+    b :
+        Vector of halfspace representation.
+    """
+
+    A: np.ndarray
+    b: np.ndarray
+
+    def __init__(
+        self,
+        A: np.ndarray,
+        b: np.ndarray,
+        row_order: Optional[cdd.RowOrderType] = None,
+    ):
+        """Build the cdd matrix of the polytope.
+
+        Parameters
+        ----------
+        A :
+            Matrix of halfspace representation.
+        b :
+            Vector of halfspace representation.
+        row_order :
+            Order in which the double description method processes
+            halfspaces. The default of cdd is used if ``None``.
+        """
+        b = b.reshape((b.shape[0], 1))
+        mat = cdd.matrix_from_array(np.hstack([b, -A]).tolist())
+        mat.rep_type = cdd.RepType.INEQUALITY
+        self.A = A
+        self.b = b.flatten()
+        self.__halfspaces: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self.__matrix = mat
+        self.__polyhedron: Optional[cdd.Polyhedron] = None
+        self.__row_order = row_order
+        self.__vertices: Optional[np.ndarray] = None
+
+    @property
+    def polyhedron(self) -> cdd.Polyhedron:
+        """Polyhedron computed by the double description method of cdd."""
+        if self.__polyhedron is None:
+            self.__polyhedron = cdd.polyhedron_from_matrix(
+                self.__matrix, row_order=self.__row_order
+            )
+        return self.__polyhedron
+
+    def add_halfspaces(
+        self, A_new: np.ndarray, b_new: np.ndarray, tol: float = 1e-10
+    ) -> None:
+        r"""Intersect the polytope with additional halfspaces.
+
+        Parameters
+        ----------
+        A_new :
+            Matrix of the new halfspaces :math:`A_{new} x \leq b_{new}`.
+        b_new :
+            Vector of the new halfspaces.
+        tol :
+            Tolerance below which a new halfspace is considered redundant.
+
+        Notes
+        -----
+        Callers that build a polytope by accumulating constraints should use
+        this function rather than creating a new instance each time. New
+        rows are appended to the cdd matrix in place, and the polyhedron is
+        only recomputed on the next query. If vertices have already been
+        computed and all of them satisfy the new halfspaces, those are
+        redundant and the cached vertices and halfspaces are kept.
+        """
+        A_new = np.atleast_2d(A_new)
+        b_new = np.asarray(b_new, dtype=float).reshape((A_new.shape[0], 1))
+        new_rows = cdd.matrix_from_array(np.hstack([b_new, -A_new]).tolist())
+        cdd.matrix_append_to(self.__matrix, new_rows)
+        self.A = np.vstack([self.A, A_new])
+        self.b = np.hstack([self.b, b_new.flatten()])
+        self.__polyhedron = None
+        redundant = self.__vertices is not None and bool(
+            np.all(self.__vertices.dot(A_new.T) <= b_new.T + tol)
+        )
+        if not redundant:
+            self.__halfspaces = None
+            self.__vertices = None
+
+    def contains(self, x: np.ndarray, tol: float = 1e-10) -> bool:
+        r"""Check whether a point lies in the polytope.
+
+        Parameters
+        ----------
+        x :
+            Point to check.
+        tol :
+            Tolerance on constraint violations.
+
+        Returns
+        -------
+        :
+            True if and only if :math:`A x \leq b + tol`.
+        """
+        return bool(np.all(self.A.dot(x) <= self.b + tol))
+
+    def halfspaces(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Get an irredundant halfspace representation of the polytope.
+
+        Returns
+        -------
+        :
+            Tuple ``(A, b)`` of the halfspace representation, where implicit
+            equalities appear as pairs of opposite inequalities.
+        """
+        if self.__halfspaces is None:
+            mat = cdd.copy_inequalities(self.polyhedron)
+            cdd.matrix_canonicalize(mat)
+            bA = np.array(mat.array, dtype=np.float64)
+            lin_rows = sorted(mat.lin_set)
+            bA = np.vstack([bA, -bA[lin_rows]]) if lin_rows else bA
+            self.__halfspaces = (-bA[:, 1:], bA[:, 0])
+        A, b = self.__halfspaces
+        return (A.copy(), b.copy())
+
+    def vertices(self) -> np.ndarray:
+        """Get the vertices of the polytope.
+
+        Returns
+        -------
+        :
+            Array of polytope vertices, one vertex per row.
+        """
+        if self.__vertices is None:
+            g = cdd.copy_generators(self.polyhedron)
+            V = np.array(g.array, dtype=np.float64)
+            V = V.reshape((-1, self.A.shape[1] + 1))
+            if np.any(V[:, 0] != 1):  # 1 = vertex, 0 = ray
+                raise ValueError("Polyhedron is not a polytope")
+            generators = np.ones(V.shape[0], dtype=bool)
+            generators[list(g.lin_set)] = False
+            self.__vertices = V[generators, 1:]  # boolean indexing copies
+        return self.__vertices.copy()
+
+
+def convex_hull(points: List[np.ndarray]) -> np.ndarray:
     """Compute the convex hull of a set of points.
 
     Parameters
@@ -146,7 +463,33 @@ def convex_hull(points: List[np.ndarray]) -> List[np.ndarray]:
     Returns
     -------
     :
-        List of polytope vertices.
+        Array of polytope vertices, one vertex per row.
+    """
+    P = stack_vertices(points)
+    return P[ConvexHull(P).vertices]
+
+
+def convex_hull_batch(
+    points_list: List[List[np.ndarray]],
+) -> List[np.ndarray]:
+    """Compute the convex hulls of several sets of points.
+
+    Parameters
+    ----------
+    points_list :
+        List of point sets.
+
+    Returns
+    -------
+    :
+        Array of polytope vertices for each point set.
+
+    Notes
+    -----
+    Qhull releases the GIL while computing a hull, so that point sets are
+    processed in parallel by a thread pool with one worker per CPU.
     """
-    hull = ConvexHull(points)
-    return [points[i] for i in hull.vertices]
+    arrays = [stack_vertices(points) for points in points_list]
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        hulls = list(executor.map(ConvexHull, arrays))
+    return [P[hull.vertices] for P, hull in zip(arrays, hulls)]
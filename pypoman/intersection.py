@@ -6,19 +6,22 @@
 
 """Intersections between lines and polyhedra."""
 
-from typing import List, Tuple
+from typing import List, Tuple, Union
 
 import numpy as np
 from scipy.spatial import ConvexHull
 
-from .misc import norm
+from .duality import convex_hull_batch
+from .misc import stack_vertices
 
+CLIPPER_SCALE = 2**31  # same fixed-point precision as scale_to_clipper
 PREC_TOL = 1e-10  # numerical tolerance
+SMALL_POLYGON_SIZE = 64  # polygons intersected by a scalar loop
 
 
 def intersect_line_polygon(
     line: Tuple[np.ndarray, np.ndarray],
-    vertices: List[np.ndarray],
+    vertices: Union[List[np.ndarray], np.ndarray],
     apply_hull: bool,
 ) -> List[np.ndarray]:
     """Intersect a line segment with a polygon.
@@ -28,7 +31,8 @@ def intersect_line_polygon(
     line :
         End points of the line segment (2D or 3D).
     vertices :
-        Vertices of the polygon.
+        Vertices of the polygon, as a list or as an array with one vertex per
+        row.
     apply_hull :
         Set to `True` to apply a convex hull algorithm to `vertices`.
         Otherwise, the function assumes that vertices are already sorted in
@@ -45,57 +49,142 @@ def intersect_line_polygon(
     <https://stackoverflow.com/questions/20677795/how-do-i-compute-the-intersection-point-of-two-lines-in-python/20679579#20679579>.
     On the same setting with `apply_hull=False`, it %timeits to 6 us.
     """
+    p1, p2 = line
+    dx, dy = float(p2[0] - p1[0]), float(p2[1] - p1[1])
+    if dx * dx + dy * dy < PREC_TOL * PREC_TOL:  # segment reduced to a point
+        return []
+    V = stack_vertices(vertices)
+    if apply_hull:
+        V = V[ConvexHull(V).vertices]
+    if V.shape[0] <= SMALL_POLYGON_SIZE:
+        return __intersect_line_small_polygon(p1, p2, V)
+    V2 = np.roll(V, -1, axis=0)  # successor of each vertex
 
-    def line_coordinates(p1, p2):
-        A = p1[1] - p2[1]
-        B = p2[0] - p1[0]
-        C = p1[0] * p2[1] - p2[0] * p1[1]
-        return A, B, -C
+    # Line coordinates (a, b, c) such that a * x + b * y = c
+    a1 = p1[1] - p2[1]
+    b1 = p2[0] - p1[0]
+    c1 = p2[0] * p1[1] - p1[0] * p2[1]
+    a2 = V[:, 1] - V2[:, 1]
+    b2 = V2[:, 0] - V[:, 0]
+    c2 = V2[:, 0] * V[:, 1] - V[:, 0] * V2[:, 1]
 
-    def intersection(L1, L2):
-        D = L1[0] * L2[1] - L1[1] * L2[0]
-        Dx = L1[2] * L2[1] - L1[1] * L2[2]
-        Dy = L1[0] * L2[2] - L1[2] * L2[0]
-        if abs(D) < 1e-5:
-            return None
-        x = Dx / D
-        y = Dy / D
-        return x, y
+    # Intersection points by Cramer's rule, NaN for parallel edges
+    D = a1 * b2 - b1 * a2
+    nonparallel = np.abs(D) >= 1e-5
+    x = np.full(D.shape, np.nan)
+    y = np.full(D.shape, np.nan)
+    np.divide(c1 * b2 - b1 * c2, D, out=x, where=nonparallel)
+    np.divide(a1 * c2 - c1 * a2, D, out=y, where=nonparallel)
 
-    if apply_hull:
-        points = vertices
-        hull = ConvexHull(points)
-        vertices = [points[i] for i in hull.vertices]
+    # Bounding boxes of the line segment and edges, compared without branches
+    x_min, x_max = min(p1[0], p2[0]) - PREC_TOL, max(p1[0], p2[0]) + PREC_TOL
+    y_min, y_max = min(p1[1], p2[1]) - PREC_TOL, max(p1[1], p2[1]) + PREC_TOL
+    edge_min = np.minimum(V, V2) - PREC_TOL
+    edge_max = np.maximum(V, V2) + PREC_TOL
+    segment_mask = (x >= x_min) & (x <= x_max) & (y >= y_min) & (y <= y_max)
+    edge_mask = (
+        (x >= edge_min[:, 0])
+        & (x <= edge_max[:, 0])
+        & (y >= edge_min[:, 1])
+        & (y <= edge_max[:, 1])
+    )
+    on_segments = nonparallel & segment_mask & edge_mask
+    return list(np.column_stack([x, y])[on_segments])
 
-    n = len(vertices)
-    p1, p2 = line
-    L1 = line_coordinates(p1, p2)
-    x_min, x_max = min(p1[0], p2[0]), max(p1[0], p2[0])
-    y_min, y_max = min(p1[1], p2[1]), max(p1[1], p2[1])
+
+def __intersect_line_small_polygon(
+    p1: np.ndarray, p2: np.ndarray, V: np.ndarray
+) -> List[np.ndarray]:
+    """Intersect a line segment with a polygon, one edge at a time.
+
+    Parameters
+    ----------
+    p1 :
+        First end point of the line segment.
+    p2 :
+        Second end point of the line segment.
+    V :
+        Vertices of the polygon, one per row, sorted in clockwise or
+        counterclockwise order.
+
+    Returns
+    -------
+    :
+        List of intersection points between the line segment and the polygon.
+
+    Notes
+    -----
+    This scalar loop computes the same points as the vectorized one in
+    :func:`intersect_line_polygon`, but is faster on polygons with few
+    vertices, where the fixed cost of NumPy calls dominates.
+    """
+    x1, y1, x2, y2 = float(p1[0]), float(p1[1]), float(p2[0]), float(p2[1])
+    a1, b1, c1 = y1 - y2, x2 - x1, x2 * y1 - x1 * y2
+    x_min, x_max = min(x1, x2) - PREC_TOL, max(x1, x2) + PREC_TOL
+    y_min, y_max = min(y1, y2) - PREC_TOL, max(y1, y2) + PREC_TOL
+    vertices = V[:, :2].tolist()
     inter_points = []
-    for i, v1 in enumerate(vertices):
-        v2 = vertices[(i + 1) % n]
-        L2 = line_coordinates(v1, v2)
-        p = intersection(L1, L2)
-        if p is not None:
-            if not (
-                x_min - PREC_TOL <= p[0] <= x_max + PREC_TOL
-                and y_min - PREC_TOL <= p[1] <= y_max + PREC_TOL
-            ):
-                continue
-            vx_min, vx_max = min(v1[0], v2[0]), max(v1[0], v2[0])
-            vy_min, vy_max = min(v1[1], v2[1]), max(v1[1], v2[1])
-            if not (
-                vx_min - PREC_TOL <= p[0] <= vx_max + PREC_TOL
-                and vy_min - PREC_TOL <= p[1] <= vy_max + PREC_TOL
-            ):
-                continue
-            inter_points.append(np.array(p))
+    for (vx1, vy1), (vx2, vy2) in zip(vertices, vertices[1:] + vertices[:1]):
+        a2, b2, c2 = vy1 - vy2, vx2 - vx1, vx2 * vy1 - vx1 * vy2
+        D = a1 * b2 - b1 * a2
+        if abs(D) < 1e-5:
+            continue
+        x = (c1 * b2 - b1 * c2) / D
+        y = (a1 * c2 - c1 * a2) / D
+        if (
+            x_min <= x <= x_max
+            and y_min <= y <= y_max
+            and min(vx1, vx2) - PREC_TOL <= x <= max(vx1, vx2) + PREC_TOL
+            and min(vy1, vy2) - PREC_TOL <= y <= max(vy1, vy2) + PREC_TOL
+        ):
+            inter_points.append(np.array([x, y]))
     return inter_points
 
 
+class PolygonCylinder:
+    """Vertical cylinder with a convex polygonal cross-section.
+
+    Attributes
+    ----------
+    vertices :
+        Vertices of the cross-section, in counterclockwise order.
+    """
+
+    vertices: np.ndarray
+
+    def __init__(self, vertices: Union[List[np.ndarray], np.ndarray]):
+        """Compute the convex hull of the cross-section once.
+
+        Parameters
+        ----------
+        vertices :
+            Vertices of the polygonal cross-section, in any order.
+        """
+        V = stack_vertices(vertices)[:, :2]
+        self.vertices = V[ConvexHull(V).vertices]
+
+    def intersect_line(
+        self, line: Tuple[np.ndarray, np.ndarray]
+    ) -> List[np.ndarray]:
+        """Intersect a line segment with the cylinder.
+
+        Parameters
+        ----------
+        line :
+            End points of the 3D line segment.
+
+        Returns
+        -------
+        :
+            List of intersection points between the line segment and the
+            cylinder.
+        """
+        return intersect_line_cylinder(line, self)
+
+
 def intersect_line_cylinder(
-    line: Tuple[np.ndarray, np.ndarray], vertices: List[np.ndarray]
+    line: Tuple[np.ndarray, np.ndarray],
+    vertices: Union[List[np.ndarray], np.ndarray, PolygonCylinder],
 ) -> List[np.ndarray]:
     """Intersect the line segment [p1, p2] with a vertical cylinder.
 
@@ -107,21 +196,78 @@ def intersect_line_cylinder(
     line :
         End points of the 3D line segment.
     vertices :
-        Vertices of the polygon.
+        Vertices of the polygon, or cylinder built from them. Building the
+        cylinder once saves computing its cross-section hull at each call
+        when intersecting several lines with the same cylinder.
 
     Returns
     -------
     inter_points :
         List of intersection points between the line segment and the cylinder.
     """
-    inter_points = []
-    inter_2d = intersect_line_polygon(line, vertices, apply_hull=True)
-    for p in inter_2d:
-        p1, p2 = np.array(line[0]), np.array(line[1])
-        alpha = norm(p - p1[:2]) / norm(p2[:2] - p1[:2])
-        z = p1[2] + alpha * (p2[2] - p1[2])
-        inter_points.append(np.array([p[0], p[1], z]))
-    return inter_points
+    if isinstance(vertices, PolygonCylinder):
+        hull = vertices.vertices
+        inter_2d = intersect_line_polygon(line, hull, apply_hull=False)
+    else:
+        inter_2d = intersect_line_polygon(line, vertices, apply_hull=True)
+    return __lift_to_segment(line, inter_2d)
+
+
+def intersect_lines_cylinder(
+    lines: List[Tuple[np.ndarray, np.ndarray]],
+    vertices_list: List[List[np.ndarray]],
+) -> List[List[np.ndarray]]:
+    """Intersect line segments with vertical cylinders.
+
+    Each line segment is intersected with the vertical cylinder of the same
+    index. Convex hulls of cylinder cross-sections are computed as a batch.
+
+    Parameters
+    ----------
+    lines :
+        End points of the 3D line segments.
+    vertices_list :
+        Vertices of the polygonal cross-section of each cylinder.
+
+    Returns
+    -------
+    :
+        List of intersection points for each line segment.
+    """
+    hulls = convex_hull_batch(vertices_list)
+    return [
+        __lift_to_segment(
+            line, intersect_line_polygon(line, hull, apply_hull=False)
+        )
+        for line, hull in zip(lines, hulls)
+    ]
+
+
+def __lift_to_segment(
+    line: Tuple[np.ndarray, np.ndarray], inter_2d: List[np.ndarray]
+) -> List[np.ndarray]:
+    """Lift points of the horizontal projection of a segment onto it.
+
+    Parameters
+    ----------
+    line :
+        End points of the 3D line segment.
+    inter_2d :
+        Points on the horizontal projection of the line segment.
+
+    Returns
+    -------
+    :
+        Corresponding points on the 3D line segment.
+    """
+    if not inter_2d:
+        return []
+    p1, p2 = np.array(line[0]), np.array(line[1])
+    P = np.asarray(inter_2d)
+    d = p2[:2] - p1[:2]
+    alpha = (P - p1[:2]).dot(d) / d.dot(d)  # points lie on the segment
+    z = p1[2] + alpha * (p2[2] - p1[2])
+    return list(np.column_stack([P, z]))
 
 
 def intersect_polygons(
@@ -143,21 +289,16 @@ def intersect_polygons(
     :
         Vertices of the intersection in counterclockwise order.
     """
-    from pyclipper import (
-        CT_INTERSECTION,
-        PT_CLIP,
-        PT_SUBJECT,
-        Pyclipper,
-        scale_from_clipper,
-        scale_to_clipper,
-    )
+    from pyclipper import CT_INTERSECTION, PT_CLIP, PT_SUBJECT, Pyclipper
+
+    def to_clipper(polygon: List[np.ndarray]) -> List[List[int]]:
+        scaled = np.rint(stack_vertices(polygon) * CLIPPER_SCALE)
+        return scaled.astype(np.int64).tolist()
 
-    # could be accelerated by removing the scale_to/from_clipper()
-    subj, clip = (polygon1,), polygon2
     pc = Pyclipper()
-    pc.AddPath(scale_to_clipper(clip), PT_CLIP)
-    pc.AddPaths(scale_to_clipper(subj), PT_SUBJECT)
+    pc.AddPath(to_clipper(polygon2), PT_CLIP)
+    pc.AddPath(to_clipper(polygon1), PT_SUBJECT)
     solution = pc.Execute(CT_INTERSECTION)
     if not solution:
         return []
-    return scale_from_clipper(solution)[0]
+    return list(np.array(solution[0], dtype=np.float64) / CLIPPER_SCALE)
@@ -11,13 +11,15 @@ instance `lpsolvers <https://github.com/stephane-caron/lpsolvers>`__ to access
 other LP solvers.
 """
 
-from typing import Optional, Union
+from typing import Optional, Sequence, Tuple, Union
 from warnings import warn
 
 import cvxopt
 import cvxopt.solvers
 import numpy as np
 from cvxopt.solvers import lp
+from scipy import sparse
+from scipy.optimize import linprog
 
 cvxopt.solvers.options["show_progress"] = False  # disable cvxopt output
 
@@ -32,18 +34,87 @@ try:
     cvxopt.solvers.options["glpk"] = {"msg_lev": "GLP_MSG_OFF"}  # cvxopt 1.1.8
     cvxopt.solvers.options["msg_lev"] = "GLP_MSG_OFF"  # cvxopt 1.1.7
     cvxopt.solvers.options["LPX_K_MSGLEV"] = 0  # previous versions
+    cvxopt.glpk.options["msg_lev"] = "GLP_MSG_OFF"  # direct calls
 except ImportError:
     # issue a warning as GLPK is the best LP solver in practice
     warn("GLPK solver not found")
 
 
-def cvxmat(M: Union[np.ndarray, cvxopt.matrix]) -> cvxopt.matrix:
-    """Convert a NumPy array to a CVXOPT matrix."""
-    if isinstance(M, cvxopt.matrix):
+def cvxmat(
+    M: Union[np.ndarray, cvxopt.matrix, cvxopt.spmatrix],
+    max_density: float = 0.0,
+) -> Union[cvxopt.matrix, cvxopt.spmatrix]:
+    """Convert a NumPy array to a CVXOPT matrix.
+
+    Parameters
+    ----------
+    M :
+        Array to convert. It is cast to a C-contiguous float64 array first,
+        so that integer or strided inputs take CVXOPT's fast buffer path.
+    max_density :
+        Matrices whose ratio of nonzero coefficients is at most this value are
+        converted to sparse CVXOPT matrices. Sparse conversion is slower, so
+        it only pays off for matrices used in several LPs.
+
+    Returns
+    -------
+    :
+        Dense or sparse CVXOPT matrix.
+    """
+    if isinstance(M, (cvxopt.matrix, cvxopt.spmatrix)):
         return M
+    M = np.ascontiguousarray(M, dtype=np.float64)
+    nnz_max = max_density * M.size
+    if M.ndim == 2 and max_density > 0.0 and np.count_nonzero(M) <= nnz_max:
+        rows, cols = M.nonzero()
+        return cvxopt.spmatrix(M[rows, cols], rows, cols, M.shape)
     return cvxopt.matrix(M)
 
 
+def cvxopt_lp(
+    c: cvxopt.matrix,
+    G: Union[cvxopt.matrix, cvxopt.spmatrix],
+    h: cvxopt.matrix,
+    A: Optional[Union[cvxopt.matrix, cvxopt.spmatrix]] = None,
+    b: Optional[cvxopt.matrix] = None,
+    solver: Optional[str] = GLPK_IF_AVAILABLE,
+) -> Tuple[str, Optional[cvxopt.matrix]]:
+    """Solve a linear program (LP) given by CVXOPT matrices.
+
+    Parameters
+    ----------
+    c :
+        Linear-cost vector.
+    G :
+        Linear inequality constraint matrix.
+    h :
+        Linear inequality constraint vector.
+    A :
+        Linear equality constraint matrix.
+    b :
+        Linear equality constraint vector.
+    solver :
+        Solver to use, default is GLPK if available
+
+    Returns
+    -------
+    :
+        Pair ``(status, x)`` of the solver status and primal solution, the
+        latter being ``None`` if the LP is not solved to optimality.
+
+    Notes
+    -----
+    GLPK is called through its CVXOPT binding directly. This skips the
+    residual computations of :func:`cvxopt.solvers.lp`, which take about
+    twice as long as GLPK itself on small LPs.
+    """
+    if solver == "glpk":
+        status, x = cvxopt.glpk.lp(c, G, h, A, b)[:2]
+        return status, x
+    sol = lp(c, G, h, A, b, solver=solver)
+    return sol["status"], sol["x"]
+
+
 def solve_lp(
     c: np.ndarray,
     G: np.ndarray,
@@ -64,7 +135,8 @@ def solve_lp(
 
     using the `CVXOPT
     <http://cvxopt.org/userguide/coneprog.html#linear-programming>`_ interface
-    to LP solvers.
+    to LP solvers, or the `HiGHS <https://highs.dev/>`_ solver shipped with
+    SciPy.
 
     Parameters
     ----------
@@ -79,7 +151,110 @@ def solve_lp(
     b :
         Linear equality constraint vector.
     solver :
-        Solver to use, default is GLPK if available
+        Solver to use, default is GLPK if available. Set to "highs" to use
+        HiGHS through :func:`scipy.optimize.linprog`.
+
+    Returns
+    -------
+    :
+        Optimal solution to the LP.
+
+    Raises
+    ------
+    ValueError
+        If the LP is not feasible.
+    """
+    if solver == "highs":
+        return __solve_lp_highs(c, G, h, A, b)
+    status, x = cvxopt_lp(
+        cvxmat(c),
+        cvxmat(G),
+        cvxmat(h),
+        None if A is None else cvxmat(A),
+        None if b is None else cvxmat(b),
+        solver=solver,
+    )
+    if "optimal" not in status:
+        raise ValueError("LP optimum not found: %s" % status)
+    return np.asarray(x).ravel()  # view on the solution buffer, no copy
+
+
+def solve_lp_batch(
+    c_list: Sequence[np.ndarray],
+    G: np.ndarray,
+    h: np.ndarray,
+    A: Optional[np.ndarray] = None,
+    b: Optional[np.ndarray] = None,
+    solver: Optional[str] = GLPK_IF_AVAILABLE,
+) -> np.ndarray:
+    """Solve a sequence of linear programs sharing the same constraints.
+
+    Parameters
+    ----------
+    c_list :
+        Sequence of linear-cost vectors, one per LP.
+    G :
+        Linear inequality constraint matrix.
+    h :
+        Linear inequality constraint vector.
+    A :
+        Linear equality constraint matrix.
+    b :
+        Linear equality constraint vector.
+    solver :
+        Solver to use, default is GLPK if available. Set to "highs" to use
+        HiGHS through :func:`scipy.optimize.linprog`.
+
+    Returns
+    -------
+    :
+        Array whose rows are the optimal solutions of each LP.
+
+    Raises
+    ------
+    ValueError
+        If one of the LPs is not feasible.
+
+    Notes
+    -----
+    Constraint matrices are converted to CVXOPT matrices only once for the
+    whole batch, which is where most of the wrapping time goes on small LPs.
+    """
+    if solver == "highs":
+        return np.array([__solve_lp_highs(c, G, h, A, b) for c in c_list])
+    G, h = cvxmat(G), cvxmat(h)
+    A = None if A is None else cvxmat(A)
+    b = None if b is None else cvxmat(b)
+    solutions = []
+    for c in c_list:
+        status, x = cvxopt_lp(cvxmat(c), G, h, A, b, solver=solver)
+        if "optimal" not in status:
+            raise ValueError("LP optimum not found: %s" % status)
+        solutions.append(np.asarray(x).ravel())
+    return np.array(solutions)
+
+
+def __solve_lp_highs(
+    c: np.ndarray,
+    G: np.ndarray,
+    h: np.ndarray,
+    A: Optional[np.ndarray] = None,
+    b: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Solve a linear program (LP) with HiGHS.
+
+    Parameters
+    ----------
+    c :
+        Linear-cost vector.
+    G :
+        Linear inequality constraint matrix, dense or SciPy sparse.
+    h :
+        Linear inequality constraint vector.
+    A :
+        Linear equality constraint matrix, dense or SciPy sparse.
+    b :
+        Linear equality constraint vector.
 
     Returns
     -------
@@ -91,10 +266,19 @@ def solve_lp(
     ValueError
         If the LP is not feasible.
     """
-    args = [cvxmat(c), cvxmat(G), cvxmat(h)]
-    if A is not None:
-        args.extend([cvxmat(A), cvxmat(b)])
-    sol = lp(*args, solver=solver)
-    if "optimal" not in sol["status"]:
-        raise ValueError("LP optimum not found: %s" % sol["status"])
-    return np.array(sol["x"]).reshape((np.array(c).shape[0],))
+    if not sparse.issparse(G):
+        G = np.ascontiguousarray(G, dtype=np.float64)
+    if A is not None and not sparse.issparse(A):
+        A = np.ascontiguousarray(A, dtype=np.float64)
+    res = linprog(
+        np.ascontiguousarray(c, dtype=np.float64).flatten(),
+        A_ub=G,
+        b_ub=np.ascontiguousarray(h, dtype=np.float64).flatten(),
+        A_eq=A,
+        b_eq=None if b is None else np.asarray(b, dtype=np.float64).flatten(),
+        bounds=(None, None),
+        method="highs",
+    )
+    if res.status != 0:
+        raise ValueError("LP optimum not found: %s" % res.message)
+    return res.x
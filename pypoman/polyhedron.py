@@ -11,9 +11,10 @@ from __future__ import division
 import numpy as np
 
 from .lp import solve_lp
-from .misc import norm
+from .misc import array_lru_cache
 
 
+@array_lru_cache
 def compute_chebyshev_center(A: np.ndarray, b: np.ndarray) -> np.ndarray:
     """Compute the Chebyshev center of a polyhedron.
 
@@ -37,8 +38,9 @@ def compute_chebyshev_center(A: np.ndarray, b: np.ndarray) -> np.ndarray:
     """
     cost = np.zeros(A.shape[1] + 1)
     cost[-1] = -1.0
-    a_cheby = np.array([norm(A[i, :]) for i in range(A.shape[0])])
-    A_cheby = np.hstack([A, a_cheby.reshape((A.shape[0], 1))])
+    A_cheby = np.empty((A.shape[0], A.shape[1] + 1))
+    A_cheby[:, :-1] = A
+    A_cheby[:, -1] = np.sqrt(np.einsum("ij,ij->i", A, A))
     z = solve_lp(cost, A_cheby, b)
     if z[-1] < -1e-1:  # last coordinate is distance to boundaries
         raise ValueError("Polytope is empty (margin violation %.2f)" % z[-1])
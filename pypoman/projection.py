@@ -9,10 +9,92 @@
 from typing import List, Optional, Tuple
 
 import cdd
-import cvxopt
 import numpy as np
+from scipy import sparse
 
+from .bretl import DirectionOptimizer
 from .bretl import compute_polygon as bretl_compute_polygon
+from .lp import GLPK_IF_AVAILABLE
+from .misc import array_lru_cache
+
+
+@array_lru_cache
+def __enumerate_generators(
+    A: np.ndarray,
+    b: np.ndarray,
+    C: Optional[np.ndarray],
+    d: Optional[np.ndarray],
+    canonicalize: bool,
+    remove_redundant: bool = False,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Enumerate the generators of a polyhedron with cdd.
+
+    Parameters
+    ----------
+    A :
+        Inequality constraint matrix.
+    b :
+        Inequality constraint vector.
+    C :
+        Equality constraint matrix, if any.
+    d :
+        Equality constraint vector, if any.
+    canonicalize :
+        Apply equality constraints to reduce the dimension of the polyhedron.
+    remove_redundant :
+        Remove redundant inequalities before enumerating generators.
+
+    Returns
+    -------
+    :
+        Pair ``(V, is_lin)`` of the generator matrix, whose rows are
+        ``[t, x]`` with ``t = 1`` for vertices and ``t = 0`` for rays, and
+        of the boolean mask of its rows in the linearity set.
+
+    Raises
+    ------
+    ValueError
+        If an equality constraint matrix is given without its vector.
+
+    Notes
+    -----
+    Results are cached, so that projecting the same polyhedron under several
+    affine maps enumerates its generators only once.
+    """
+    # the input [b, -A] to cdd.Matrix represents (b - A * x >= 0)
+    # see ftp://ftp.ifor.math.ethz.ch/pub/fukuda/cdd/cddlibman/node3.html
+    bA = np.empty((A.shape[0], A.shape[1] + 1))
+    bA[:, 0] = np.ravel(b)
+    np.negative(A, out=bA[:, 1:])
+    linsys = cdd.matrix_from_array(bA.tolist())
+    linsys.rep_type = cdd.RepType.INEQUALITY
+
+    # the input [d, -C] to the cdd function represents (d - C * x == 0)
+    # see ftp://ftp.ifor.math.ethz.ch/pub/fukuda/cdd/cddlibman/node3.html
+    if C is not None:
+        if d is None:
+            raise ValueError("Equality constraint vector d is missing")
+        dC = np.empty((C.shape[0], C.shape[1] + 1))
+        dC[:, 0] = np.ravel(d)
+        np.negative(C, out=dC[:, 1:])
+        new_matrix = cdd.matrix_from_array(dC.tolist())
+        cdd.matrix_append_to(linsys, new_matrix)
+        linsys.rep_type = cdd.RepType.INEQUALITY
+        if canonicalize:
+            cdd.matrix_canonicalize(linsys)
+
+    # canonicalization already removes redundant rows
+    if remove_redundant and (C is None or not canonicalize):
+        cdd.matrix_redundancy_remove(linsys)
+
+    # Convert from H- to V-representation
+    P = cdd.polyhedron_from_matrix(linsys)
+    generators = cdd.copy_generators(P)
+    V = np.array(generators.array, dtype=np.float64)
+    V = V.reshape((-1, A.shape[1] + 1))
+    is_lin = np.zeros(V.shape[0], dtype=bool)
+    is_lin[list(generators.lin_set)] = True
+    return V, is_lin
 
 
 def project_polyhedron(
@@ -20,6 +102,7 @@ def project_polyhedron(
     ineq: Tuple[np.ndarray, np.ndarray],
     eq: Optional[Tuple[np.ndarray, np.ndarray]] = None,
     canonicalize: bool = True,
+    remove_redundant: bool = False,
 ) -> Tuple[List[np.ndarray], List[np.ndarray]]:
     r"""Apply the affine projection :math:`y = E x + f` to a polyhedron.
 
@@ -43,6 +126,11 @@ def project_polyhedron(
     canonicalize : bool, optional
         Apply equality constraints from `eq` to reduce the dimension of the
         input polyhedron. May be a blessing or a curse, see notes below.
+    remove_redundant : bool, optional
+        Remove redundant inequalities from `ineq` before enumerating
+        vertices. This is only worth it on descriptions with many redundant
+        constraints that touch vertices of the polyhedron, as the redundancy
+        test solves one LP per inequality.
 
     Returns
     -------
@@ -65,42 +153,26 @@ def project_polyhedron(
     --------
     This webpage: https://scaron.info/teaching/projecting-polytopes.html
     """
-    # the input [b, -A] to cdd.Matrix represents (b - A * x >= 0)
-    # see ftp://ftp.ifor.math.ethz.ch/pub/fukuda/cdd/cddlibman/node3.html
     (A, b) = ineq
-    b = b.reshape((b.shape[0], 1))
-    linsys = cdd.matrix_from_array(np.hstack([b, -A]))  # type: ignore
-    linsys.rep_type = cdd.RepType.INEQUALITY
-
-    # the input [d, -C] to the cdd function represents (d - C * x == 0)
-    # see ftp://ftp.ifor.math.ethz.ch/pub/fukuda/cdd/cddlibman/node3.html
-    if eq is not None:
-        (C, d) = eq
-        d = d.reshape((d.shape[0], 1))
-        new_matrix = cdd.matrix_from_array(np.hstack([d, -C]))  # type: ignore
-        cdd.matrix_append_to(linsys, new_matrix)
-        linsys.rep_type = cdd.RepType.INEQUALITY
-        if canonicalize:
-            cdd.matrix_canonicalize(linsys)
-
-    # Convert from H- to V-representation
-    P = cdd.polyhedron_from_matrix(linsys)
-    generators = cdd.copy_generators(P)
-    if generators.lin_set:
-        print("Generators have linear set: {}".format(generators.lin_set))
-    V = np.array(generators.array)
+    (C, d) = eq if eq is not None else (None, None)
+    V, is_lin = __enumerate_generators(
+        A, b, C, d, canonicalize, remove_redundant
+    )
+    if is_lin.any():
+        lin_set = set(np.flatnonzero(is_lin).tolist())
+        print("Generators have linear set: {}".format(lin_set))
 
     # Project output wrenches to 2D set
     (E, f) = proj
-    vertices, rays = [], []
-    free_coordinates = []
-    for i in range(V.shape[0]):
-        if generators.lin_set and i in generators.lin_set:
-            free_coordinates.append(list(V[i, 1:]).index(1.0))
-        elif V[i, 0] == 1:  # vertex
-            vertices.append(np.dot(E, V[i, 1:]) + f)
-        else:  # ray
-            rays.append(np.dot(E, V[i, 1:]))
+    is_vertex = V[:, 0] == 1
+    if is_lin.any():
+        is_vertex &= ~is_lin
+        is_ray = ~is_vertex & ~is_lin
+    else:  # common case: generators are only vertices and rays
+        is_ray = ~is_vertex
+    Y = V[:, 1:] @ E.T  # all generators projected at once
+    vertices = list(Y[is_vertex] + f)
+    rays = list(Y[is_ray])
     return vertices, rays
 
 
@@ -150,6 +222,151 @@ def project_polytope(proj, ineq, eq=None, method="cdd", **kwargs):
     return vertices
 
 
+class PolytopeProjector:
+    r"""Project a polytope into a 2D polygon using the IP algorithm.
+
+    The incremental projection algorithm is detailed in [Bretl08]_. The 2D
+    affine projection :math:`y = E x + f` is applied to the polyhedron defined
+    by:
+
+    .. math::
+
+        A x & \leq b \\
+        C x & = d
+
+    The extended linear program of the algorithm is built once at
+    construction, so that the same polytope can be projected repeatedly
+    without rebuilding it.
+
+    Attributes
+    ----------
+    optimizer :
+        Direction optimizer over the extended linear program.
+    """
+
+    optimizer: DirectionOptimizer
+
+    def __init__(
+        self,
+        proj: Tuple[np.ndarray, np.ndarray],
+        ineq: Tuple[np.ndarray, np.ndarray],
+        eq: Tuple[np.ndarray, np.ndarray],
+        max_radius: float = 1e5,
+        max_density: float = 0.0,
+        solver: Optional[str] = GLPK_IF_AVAILABLE,
+    ):
+        """
+        Build the extended linear program.
+
+        Parameters
+        ----------
+        proj :
+            Pair (`E`, `f`) describing the affine projection.
+        ineq :
+            Pair (`A`, `b`) describing the inequality constraint.
+        eq :
+            Pair (`C`, `d`) describing the equality constraint.
+        max_radius :
+            Maximum distance from origin (in [m]) used to make sure the output
+            is bounded.
+        max_density :
+            Extended constraint matrices whose ratio of nonzero coefficients is
+            at most this value are passed to the LP solver as sparse matrices.
+            This saves memory on large sparse polytopes, but does not make
+            GLPK faster, hence it is disabled by default.
+        solver :
+            Backend LP solver to call, default is GLPK if available. Set to
+            "highs" to solve LPs with HiGHS, which pays off on large polytopes.
+        """
+        (E, f), (A, b), (C, d) = proj, ineq, eq
+        assert E.shape[0] == f.shape[0] == 2
+
+        # Inequality constraints: A_ext * [ x  u  v ] <= b_ext iff
+        # (1) A * x <= b and (2) |u|, |v| <= max_radius
+        A_ext = np.zeros((A.shape[0] + 4, A.shape[1] + 2))
+        A_ext[:-4, :-2] = A
+        A_ext[-4:, -2:] = [[1.0, 0.0], [-1.0, 0.0], [0.0, 1.0], [0.0, -1.0]]
+
+        b_ext = np.zeros(b.shape[0] + 4)
+        b_ext[:-4] = b
+        b_ext[-4:] = max_radius
+
+        # Equality constraints: C_ext * [ x  u  v ] == d_ext iff
+        # (1) C * x == d and (2) [ u  v ] == E * x + f
+        C_ext = np.zeros((C.shape[0] + 2, C.shape[1] + 2))
+        C_ext[:-2, :-2] = C
+        C_ext[-2:, :-2] = E[:2]
+        C_ext[-2:, -2:] = -np.eye(2)
+
+        d_ext = np.zeros(d.shape[0] + 2)
+        d_ext[:-2] = d
+        d_ext[-2:] = -f[:2]
+
+        lp_obj = np.zeros(A.shape[1] + 2)
+        lp = lp_obj, A_ext, b_ext, C_ext, d_ext
+        self.optimizer = DirectionOptimizer(lp, solver, max_density)
+
+    def update_vectors(
+        self,
+        b: Optional[np.ndarray] = None,
+        d: Optional[np.ndarray] = None,
+        f: Optional[np.ndarray] = None,
+    ) -> None:
+        """Update the constraint and offset vectors of the projection.
+
+        The extended linear program is modified in place, which is cheaper
+        than building a new projector when only these vectors change.
+
+        Parameters
+        ----------
+        b :
+            New inequality constraint vector, if any.
+        d :
+            New equality constraint vector, if any.
+        f :
+            New offset of the affine projection, if any.
+        """
+        _, _, lp_h, _, lp_b = self.optimizer.lp
+        if b is not None:
+            h_ext = np.array(lp_h).flatten()
+            h_ext[:-4] = b
+            self.optimizer.update_vectors(h=h_ext)
+        if d is not None or f is not None:
+            d_ext = np.array(lp_b).flatten()
+            if d is not None:
+                d_ext[:-2] = d
+            if f is not None:
+                d_ext[-2:] = -f[:2]
+            self.optimizer.update_vectors(b=d_ext)
+
+    def project(
+        self,
+        max_iter: int = 1000,
+        init_angle: Optional[float] = None,
+    ) -> List[np.ndarray]:
+        """Compute the projected polygon.
+
+        Parameters
+        ----------
+        max_iter :
+            Maximum number of calls to the LP solver.
+        init_angle :
+            Angle in [rad] giving the direction of the initial ray cast.
+
+        Returns
+        -------
+        :
+            List of vertices of the projected polygon.
+        """
+        polygon = bretl_compute_polygon(
+            self.optimizer, max_iter=max_iter, init_angle=init_angle
+        )
+        polygon.sort_vertices()
+        vertices_list = polygon.export_vertices()
+        coordinates = [(v.x, v.y) for v in vertices_list]
+        return list(np.array(coordinates).reshape((-1, 2)))
+
+
 def project_polytope_bretl(
     proj: Tuple[np.ndarray, np.ndarray],
     ineq: Tuple[np.ndarray, np.ndarray],
@@ -157,6 +374,7 @@ def project_polytope_bretl(
     max_radius: float = 1e5,
     max_iter: int = 1000,
     init_angle: Optional[float] = None,
+    solver: Optional[str] = GLPK_IF_AVAILABLE,
 ) -> List[np.ndarray]:
     r"""Project a polytope into a 2D polygon using the IP algorithm.
 
@@ -184,52 +402,22 @@ def project_polytope_bretl(
         Maximum number of calls to the LP solver.
     init_angle :
         Angle in [rad] giving the direction of the initial ray cast.
+    solver :
+        Backend LP solver to call, default is GLPK if available. Set to
+        "highs" to solve LPs with HiGHS, which pays off on large polytopes.
 
     Returns
     -------
     :
         List of vertices of the projected polygon.
+
+    Note
+    ----
+    Use :class:`pypoman.projection.PolytopeProjector` directly to project the
+    same polytope several times.
     """
-    (E, f), (A, b), (C, d) = proj, ineq, eq
-    assert E.shape[0] == f.shape[0] == 2
-
-    # Inequality constraints: A_ext * [ x  u  v ] <= b_ext iff
-    # (1) A * x <= b and (2) |u|, |v| <= max_radius
-    A_ext = np.zeros((A.shape[0] + 4, A.shape[1] + 2))
-    A_ext[:-4, :-2] = A
-    A_ext[-4, -2] = 1
-    A_ext[-3, -2] = -1
-    A_ext[-2, -1] = 1
-    A_ext[-1, -1] = -1
-    A_ext = cvxopt.matrix(A_ext)
-
-    b_ext = np.zeros(b.shape[0] + 4)
-    b_ext[:-4] = b
-    b_ext[-4:] = np.array([max_radius] * 4)
-    b_ext = cvxopt.matrix(b_ext)
-
-    # Equality constraints: C_ext * [ x  u  v ] == d_ext iff
-    # (1) C * x == d and (2) [ u  v ] == E * x + f
-    C_ext = np.zeros((C.shape[0] + 2, C.shape[1] + 2))
-    C_ext[:-2, :-2] = C
-    C_ext[-2:, :-2] = E[:2]
-    C_ext[-2:, -2:] = np.array([[-1, 0], [0, -1]])
-    C_ext = cvxopt.matrix(C_ext)
-
-    d_ext = np.zeros(d.shape[0] + 2)
-    d_ext[:-2] = d
-    d_ext[-2:] = -f[:2]
-    d_ext = cvxopt.matrix(d_ext)
-
-    lp_obj = cvxopt.matrix(np.zeros(A.shape[1] + 2))
-    lp = lp_obj, A_ext, b_ext, C_ext, d_ext
-    polygon = bretl_compute_polygon(
-        lp, max_iter=max_iter, init_angle=init_angle
-    )
-    polygon.sort_vertices()
-    vertices_list = polygon.export_vertices()
-    vertices = [np.array([v.x, v.y]) for v in vertices_list]
-    return vertices
+    projector = PolytopeProjector(proj, ineq, eq, max_radius, solver=solver)
+    return projector.project(max_iter=max_iter, init_angle=init_angle)
 
 
 def project_point_to_polytope(
@@ -269,3 +457,57 @@ def project_point_to_polytope(
 
     P = np.eye(len(point))
     return solve_ls(P, point, G=ineq[0], h=ineq[1], solver=qpsolver, **kwargs)
+
+
+def project_points_to_polytope(
+    points: np.ndarray,
+    ineq: Tuple[np.ndarray, np.ndarray],
+    qpsolver: str,
+    **kwargs,
+) -> np.ndarray:
+    """
+    Project several points onto a polytope in H-representation.
+
+    Parameters
+    ----------
+    points :
+        Array of shape (k, n) whose rows are the points to project.
+    ineq :
+        Pair (`A`, `b`) describing the inequality constraint.
+    qpsolver :
+        Name of the backend quadratic programming solver to use, to be picked
+        in ``qpsolvers.available_solvers``. It should accept sparse matrices.
+
+    Returns
+    -------
+    :
+        Array of shape (k, n) whose rows are the projected points.
+
+    Raises
+    ------
+    ValueError
+        If the quadratic program could not be solved.
+
+    Note
+    ----
+    All projections are solved at once as a single quadratic program with
+    block-diagonal matrices, which is much faster than calling
+    :func:`project_point_to_polytope` on each point. This function requires
+    `qpsolvers <https://pypi.org/project/qpsolvers/>`_.
+    """
+    try:
+        from qpsolvers import solve_qp
+    except ImportError as e:
+        raise ImportError(
+            "This function requires qpsolvers: pip install qpsolvers"
+        ) from e
+
+    points = np.asarray(points, dtype=np.float64)
+    (A, b), (k, n) = ineq, points.shape
+    P = sparse.eye(k * n, format="csc")
+    G = sparse.kron(sparse.eye(k), A, format="csc")
+    h = np.tile(b, k)
+    x = solve_qp(P, -points.ravel(), G, h, solver=qpsolver, **kwargs)
+    if x is None:
+        raise ValueError("QP solution not found")
+    return x.reshape((k, n))
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright 2018 Stéphane Caron
+
+"""Unit tests for the Bretl projection algorithm."""
+
+import unittest
+
+import numpy as np
+
+from pypoman import project_polytope
+from pypoman.bretl import (
+    DirectionOptimizer,
+    Polygon,
+    Vertex,
+    compute_polygon,
+    optimize_directions,
+)
+
+
+class TestBretl(unittest.TestCase):
+    """Test fixture for the Bretl projection algorithm."""
+
+    def setUp(self):
+        # Square |u|, |v| <= 1 in the plane, with no other variable
+        q = np.zeros(2)
+        G = np.vstack([np.eye(2), -np.eye(2)])
+        h = np.ones(4)
+        self.lp = (q, G, h, None, None)
+
+    def test_optimize_directions(self):
+        directions = np.array([[1.0, 1.0], [-1.0, 1.0], [-1.0, -1.0]])
+        optima = optimize_directions(directions, self.lp)
+        self.assertEqual(optima.shape, (3, 2))
+        self.assertTrue(np.allclose(optima, directions))
+
+    def test_direction_optimizer_unbounded(self):
+        q = np.zeros(2)
+        G = np.eye(2)  # u, v <= 1 but no lower bound
+        h = np.ones(2)
+        optimizer = DirectionOptimizer((q, G, h, None, None))
+        with self.assertRaises(ValueError):
+            optimizer.optimize(np.array([-1.0, 0.0]))
+        optima = optimizer.optimize_many(np.array([[1.0, 1.0], [-1.0, 0.0]]))
+        self.assertTrue(np.allclose(optima[0], [1.0, 1.0]))
+        self.assertTrue(np.isnan(optima[1]).all())
+
+    def test_vertex_expand(self):
+        q = np.zeros(2)
+        G = np.array([[1.0, 1.0], [1.0, -1.0], [-1.0, 1.0], [-1.0, -1.0]])
+        h = np.ones(4)  # diamond |u| + |v| <= 1
+        v1, v2 = Vertex([1.0, 0.0]), Vertex([-1.0, 0.0])
+        v1.next, v2.next = v2, v1
+        vnew = v1.expand((q, G, h, None, None))
+        self.assertIsNotNone(vnew)
+        self.assertAlmostEqual(vnew.x, 0.0)
+        self.assertAlmostEqual(vnew.y, 1.0)
+        self.assertIs(v1.next, vnew)
+        self.assertIsNone(vnew.expand((q, G, h, None, None)))
+        self.assertTrue(vnew.expanded)
+
+    def test_compute_polygon_thin_triangle(self):
+        q = np.zeros(2)
+        G = np.array([[0.0, -1.0], [1.0, 100.0], [-1.0, 100.0]])
+        h = np.array([0.0, 1.0, 1.0])  # vertices (-1, 0), (1, 0), (0, 0.01)
+        lp = (q, G, h, None, None)
+        polygon = compute_polygon(lp, init_angle=0.0)
+        self.assertEqual(len(polygon.vertices), 3)
+        self.assertTrue(polygon.all_expanded())
+
+    def test_export_vertices(self):
+        v1, v2 = Vertex([0.0, 0.0]), Vertex([1e-3, 0.0])
+        v3 = Vertex([1.0, 1.0])
+        polygon = Polygon(v1, v2, v3)
+        self.assertEqual(polygon.export_vertices(min_dist=1e-2), [v1, v3])
+        self.assertEqual(polygon.export_vertices(min_dist=1e-4), [v1, v2, v3])
+
+    def test_update_vectors_without_equalities(self):
+        optimizer = DirectionOptimizer(self.lp)
+        with self.assertRaises(ValueError):
+            optimizer.update_vectors(b=np.zeros(1))
+
+    def test_on_planar_boundary(self):
+        optimizer = DirectionOptimizer(self.lp)
+        starts = np.array([[1.0, -1.0], [1.0, -1.0]])
+        ends = np.array([[1.0, 1.0], [-1.0, 1.0]])
+        on_boundary = optimizer.on_planar_boundary(starts, ends)
+        self.assertEqual(list(on_boundary), [True, False])
+
+    def test_on_planar_boundary_scaled_row(self):
+        q, G, h, _, _ = self.lp
+        G, h = np.array(G), np.array(h)
+        G[0], h[0] = 1e-4 * G[0], 1e-4 * h[0]  # x <= 1 scaled down
+        optimizer = DirectionOptimizer((q, G, h, None, None))
+        starts = np.array([[1.0, -1.0], [0.995, -1.0]])
+        ends = np.array([[1.0, 1.0], [0.995, 1.0]])
+        on_boundary = optimizer.on_planar_boundary(starts, ends)
+        self.assertEqual(list(on_boundary), [True, False])
+
+    def test_zero_inequality_row(self):
+        # Box projection with an extra all-zero row 0 <= 0 in A x <= b
+        n = 4
+        A = np.vstack([np.eye(n), -np.eye(n), np.zeros((1, n))])
+        b = np.concatenate([np.ones(2 * n), [0.0]])
+        E = np.zeros((2, n))
+        E[0, 0] = 1.0
+        E[1, 1] = 1.0
+        C = np.zeros((1, n))
+        C[0, -1] = 1.0
+        vertices = project_polytope(
+            (E, np.zeros(2)), (A, b), (C, np.zeros(1)), method="bretl"
+        )
+        self.assertEqual(len(vertices), 4)
+
+    def test_compute_polygon_square(self):
+        polygon = compute_polygon(self.lp, init_angle=0.1)
+        self.assertEqual(len(polygon.vertices), 4)
+        self.assertTrue(polygon.all_expanded())
@@ -8,29 +8,46 @@
 
 import unittest
 
+import cdd
 import numpy as np
 
 from pypoman import (
+    PolytopeEvaluable,
+    clear_cache,
     compute_cone_face_matrix,
     compute_polytope_halfspaces,
     compute_polytope_vertices,
     convex_hull,
+    convex_hull_batch,
+    set_cache_size,
 )
+from pypoman.misc import array_lru_cache
 
 
 class TestDuality(unittest.TestCase):
     """Test fixture for duality conversions."""
 
     def test_halfspace_enumeration(self):
-        vertices = [
-            np.array(a)
-            for a in [[1, 0, 0], [0, 1, 0], [1, 1, 0], [0, 0, 1], [0, 1, 1]]
-        ]
+        vertices = np.array(
+            [[1, 0, 0], [0, 1, 0], [1, 1, 0], [0, 0, 1], [0, 1, 1]],
+            dtype=np.float64,
+        )
         A, b = compute_polytope_halfspaces(vertices)
         self.assertEqual(A.shape[0], b.shape[0])
         self.assertGreater(len(b), 4)
         self.assertLess(len(b), 10)
 
+    def test_halfspace_enumeration_qhull(self):
+        cube = [np.array(v, dtype=float) for v in np.ndindex(2, 2, 2)]
+        A, b = compute_polytope_halfspaces(cube, backend="qhull")
+        self.assertEqual(A.shape, (6, 3))
+        self.assertEqual(b.shape, (6,))
+        for v in cube:
+            self.assertTrue(np.all(A.dot(v) <= b + 1e-10))
+        self.assertFalse(np.all(A.dot([1.1, 0.5, 0.5]) <= b))
+        with self.assertRaises(ValueError):
+            compute_polytope_halfspaces(cube, backend="foo")
+
     def test_vertex_enumeration(self):
         A = np.array(
             [
@@ -59,6 +76,112 @@ class TestDuality(unittest.TestCase):
         vertices = compute_polytope_vertices(A, b)
         self.assertGreater(len(vertices), 50)
         self.assertLess(len(vertices), 500)
+        ordered = compute_polytope_vertices(
+            A, b, row_order=cdd.RowOrderType.MAX_CUTOFF
+        )
+        self.assertEqual(len(ordered), len(vertices))
+
+    def test_vertex_enumeration_qhull(self):
+        A = np.vstack([[1.0, 1.0, 1.0], np.eye(3), -np.eye(3)])
+        b = np.array([2.0, 1.0, 1.0, 1.0, 0.0, 0.0, 0.0])
+        vertices = compute_polytope_vertices(A, b, backend="qhull")
+        expected = compute_polytope_vertices(A, b, backend="cdd")
+        self.assertEqual(len(vertices), len(expected))
+        for v in expected:
+            self.assertTrue(np.any(np.all(np.isclose(vertices, v), axis=1)))
+        with self.assertRaises(ValueError):  # unbounded
+            compute_polytope_vertices(A[:4], b[:4], backend="qhull")
+        slab = (np.array([[1.0, 0.0], [-1.0, 0.0]]), np.array([1.0, 1.0]))
+        prism = (
+            np.array([[-1.0, 0.0, 0.0], [0.0, -1.0, 0.0], [1.0, 1.0, 0.0]]),
+            np.array([0.0, 0.0, 1.0]),
+        )
+        for A_unb, b_unb in (slab, prism):
+            with self.assertRaises(ValueError):
+                compute_polytope_vertices(A_unb, b_unb, backend="qhull")
+        with self.assertRaises(ValueError):
+            compute_polytope_vertices(A, b, backend="foo")
+
+    def test_box_vertices(self):
+        A = np.vstack([np.eye(3), -2.0 * np.eye(3), [[1.0, 0.0, 0.0]]])
+        b = np.array([1.0, 2.0, 3.0, 0.0, 2.0, 4.0, 5.0])
+        vertices = compute_polytope_vertices(A, b)
+        expected = PolytopeEvaluable(A, b).vertices()
+        self.assertEqual(len(vertices), 8)
+        self.assertEqual(
+            sorted(map(tuple, vertices)),
+            sorted(map(tuple, np.round(expected, 10) + 0.0)),
+        )
+
+    def test_simplex_vertices(self):
+        A = np.array([[-1.0, 0.0], [0.0, -1.0], [1.0, 2.0]])
+        b = np.array([0.0, 0.0, 2.0])
+        vertices = compute_polytope_vertices(A, b)
+        self.assertEqual(len(vertices), 3)
+        for expected in ([0.0, 0.0], [2.0, 0.0], [0.0, 1.0]):
+            self.assertTrue(any(np.allclose(v, expected) for v in vertices))
+
+    def test_unbounded_special_cases(self):
+        with self.assertRaises(ValueError):  # box without lower bounds
+            compute_polytope_vertices(np.eye(2), np.ones(2))
+        with self.assertRaises(ValueError):  # unbounded triangle
+            compute_polytope_vertices(
+                -np.array([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]]),
+                -np.array([0.0, 0.0, 1.0]),
+            )
+
+    def test_polytope_evaluable(self):
+        A = np.vstack([np.eye(2), -np.eye(2), [[1.0, 1.0]]])
+        b = np.array([1.0, 1.0, 1.0, 1.0, 10.0])  # last row is redundant
+        polytope = PolytopeEvaluable(A, b)
+        vertices = polytope.vertices()
+        self.assertEqual(len(vertices), 4)
+        vertices[0][0] = 42.0
+        self.assertNotIn(42.0, np.array(polytope.vertices()))
+        A_irr, b_irr = polytope.halfspaces()
+        self.assertEqual(A_irr.shape, (4, 2))
+        self.assertEqual(b_irr.shape, (4,))
+        self.assertTrue(polytope.contains(np.array([0.5, -0.5])))
+        self.assertFalse(polytope.contains(np.array([1.5, 0.0])))
+
+    def test_polytope_evaluable_add_halfspaces(self):
+        A = np.vstack([np.eye(2), -np.eye(2)])
+        polytope = PolytopeEvaluable(A, np.ones(4))
+        self.assertEqual(len(polytope.vertices()), 4)
+        polytope.add_halfspaces(np.array([[1.0, 1.0]]), np.array([10.0]))
+        self.assertEqual(len(polytope.vertices()), 4)
+        self.assertEqual(polytope.A.shape, (5, 2))
+        polytope.add_halfspaces(np.array([[1.0, 1.0]]), np.array([-1.0]))
+        self.assertEqual(len(polytope.vertices()), 3)
+        self.assertEqual(polytope.halfspaces()[0].shape, (3, 2))
+        self.assertFalse(polytope.contains(np.array([0.9, 0.9])))
+
+    def test_cached_cone_face_matrix(self):
+        clear_cache()
+        S = np.array([[1.0, 0.0], [0.0, 1.0]])
+        F = compute_cone_face_matrix(S)
+        F[0, 0] = 42.0
+        self.assertNotEqual(compute_cone_face_matrix(S)[0, 0], 42.0)
+        set_cache_size(0)
+        try:
+            self.assertEqual(compute_cone_face_matrix(S).shape, (2, 2))
+        finally:
+            set_cache_size(128)
+
+    def test_cache_skips_large_results(self):
+        calls = []
+
+        @array_lru_cache
+        def zeros(n):
+            calls.append(n)
+            return np.zeros(n)
+
+        zeros(10)
+        zeros(10)
+        self.assertEqual(len(calls), 1)
+        zeros(1 << 18)  # two megabytes
+        zeros(1 << 18)
+        self.assertEqual(len(calls), 3)
 
     def test_compute_cone_face_matrix(self):
         S = np.array([[1.0, 0.0], [0.0, 1.0]])
@@ -66,12 +189,25 @@ class TestDuality(unittest.TestCase):
         self.assertEqual(len(F), 2)
 
     def test_convex_hull(self):
-        polygon = [
+        polygon = np.array(
+            [[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0], [0.5, 0.5]]
+        )
+        hull = convex_hull(polygon)
+        self.assertEqual(len(hull), 4)
+
+    def test_convex_hull_batch(self):
+        square = [
             np.array([0.0, 0.0]),
             np.array([1.0, 0.0]),
             np.array([1.0, 1.0]),
             np.array([0.0, 1.0]),
             np.array([0.5, 0.5]),
         ]
-        hull = convex_hull(polygon)
-        self.assertEqual(len(hull), 4)
+        triangle = [
+            np.array([0.0, 0.0]),
+            np.array([1.0, 0.0]),
+            np.array([0.0, 1.0]),
+            np.array([0.2, 0.2]),
+        ]
+        hulls = convex_hull_batch([square, triangle])
+        self.assertEqual([len(hull) for hull in hulls], [4, 3])
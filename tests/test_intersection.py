@@ -11,8 +11,10 @@ import unittest
 import numpy as np
 
 from pypoman import (
+    PolygonCylinder,
     intersect_line_cylinder,
     intersect_line_polygon,
+    intersect_lines_cylinder,
     intersect_polygons,
 )
 
@@ -20,46 +22,65 @@ from pypoman import (
 class TestIntersection(unittest.TestCase):
     """Test fixture for intersection algorithms."""
 
+    def setUp(self):
+        # Regular dodecagon inscribed in the unit circle
+        thetas = np.arange(0, 2 * np.pi, np.pi / 6)
+        self.vertices = list(zip(np.cos(thetas), np.sin(thetas)))
+
     def test_intersect_line_polygon(self):
-        vertices = [
-            (np.cos(theta), np.sin(theta))
-            for theta in np.arange(0, 2 * np.pi, np.pi / 6)
-        ]
         line = (np.array([2.1, 1.9]), np.array([0.0, 0.0]))
-        inter = intersect_line_polygon(line, vertices, apply_hull=False)
+        inter = intersect_line_polygon(line, self.vertices, apply_hull=False)
         self.assertEqual(len(inter), 1)
 
+    def test_intersect_line_large_polygon(self):
+        thetas = np.arange(0, 2 * np.pi, np.pi / 60)
+        vertices = np.column_stack([np.cos(thetas), np.sin(thetas)])
+        line = (np.array([-2.0, 0.1]), np.array([2.0, 0.3]))
+        inter = intersect_line_polygon(line, vertices, apply_hull=False)
+        self.assertEqual(len(inter), 2)
+        for p in inter:
+            self.assertAlmostEqual(np.linalg.norm(p), 1.0, places=3)
+
+    def test_intersect_point_polygon(self):
+        point = np.array([1.0, 0.0])
+        inter = intersect_line_polygon((point, point), self.vertices, True)
+        self.assertEqual(len(inter), 0)
+
     def test_intersect_line_polygon_with_hull(self):
-        vertices = [
-            (np.cos(theta), np.sin(theta))
-            for theta in np.arange(0, 2 * np.pi, np.pi / 6)
-        ]
         line = (np.array([2.1, 1.9]), np.array([0.0, 0.0]))
-        inter = intersect_line_polygon(line, vertices, apply_hull=True)
+        inter = intersect_line_polygon(line, self.vertices, apply_hull=True)
         self.assertEqual(len(inter), 1)
 
     def test_intersect_line_cylinder(self):
-        vertices = [
-            (np.cos(theta), np.sin(theta))
-            for theta in np.arange(0, 2 * np.pi, np.pi / 6)
-        ]
         line = (np.array([2.1, 1.9, -1.1]), np.array([0.0, 0.0, 0.0]))
-        inter = intersect_line_cylinder(line, vertices)
+        inter = intersect_line_cylinder(line, self.vertices)
         self.assertEqual(len(inter), 1)
 
-    def test_intersect_polygons(self):
-        polygon1 = [
-            np.array([0.0, 0.0]),
-            np.array([1.0, 0.0]),
-            np.array([1.0, 1.0]),
-            np.array([0.0, 1.0]),
-        ]
-        polygon2 = [
-            np.array([0.5, 0.5]),
-            np.array([1.5, 0.5]),
-            np.array([1.5, 1.5]),
-            np.array([0.5, 1.5]),
+    def test_polygon_cylinder(self):
+        cylinder = PolygonCylinder(self.vertices + [(0.0, 0.0)])
+        self.assertEqual(cylinder.vertices.shape, (12, 2))
+        line = (np.array([2.1, 1.9, -1.1]), np.array([0.0, 0.0, 0.0]))
+        inter = cylinder.intersect_line(line)
+        expected = intersect_line_cylinder(line, self.vertices)
+        self.assertEqual(len(inter), 1)
+        self.assertTrue(np.allclose(inter[0], expected[0]))
+
+    def test_intersect_lines_cylinder(self):
+        lines = [
+            (np.array([2.1, 1.9, -1.1]), np.array([0.0, 0.0, 0.0])),
+            (np.array([2.0, 2.0, 1.0]), np.array([3.0, 3.0, 1.0])),
         ]
+        vertices_list = [self.vertices, self.vertices]
+        inters = intersect_lines_cylinder(lines, vertices_list)
+        self.assertEqual(len(inters[0]), 1)
+        self.assertEqual(len(inters[1]), 0)
+        expected = intersect_line_cylinder(lines[0], self.vertices)
+        self.assertTrue(np.allclose(inters[0][0], expected[0]))
+        self.assertEqual(inters[0][0].shape, (3,))
+
+    def test_intersect_polygons(self):
+        polygon1 = np.array([[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0]])
+        polygon2 = np.array([[0.5, 0.5], [1.5, 0.5], [1.5, 1.5], [0.5, 1.5]])
         inter = intersect_polygons(polygon1, polygon2)
         self.assertEqual(len(inter), 4)
 
@@ -8,9 +8,10 @@
 
 import unittest
 
+import cvxopt
 import numpy as np
 
-from pypoman.lp import solve_lp
+from pypoman.lp import cvxmat, solve_lp, solve_lp_batch
 
 
 class TestLP(unittest.TestCase):
@@ -29,3 +30,39 @@ class TestLP(unittest.TestCase):
         h = np.zeros(2)
         with self.assertRaises(ValueError):
             solve_lp(c, G, h)
+
+    def test_solve_lp_highs(self):
+        c = np.array([-1.0, -1.0])
+        G = np.array([[1.0, 0.0], [0.0, 1.0]])
+        h = np.array([1.0, 2.0])
+        A = np.array([[1.0, -1.0]])
+        b = np.array([0.0])
+        x = solve_lp(c, G, h, A, b, solver="highs")
+        self.assertTrue(np.allclose(x, solve_lp(c, G, h, A, b)))
+        with self.assertRaises(ValueError):
+            solve_lp(-c, G, h, solver="highs")
+
+    def test_cvxmat_sparse(self):
+        G = np.vstack([np.eye(3), -np.eye(3)])
+        self.assertIsInstance(cvxmat(G), cvxopt.matrix)
+        G_sparse = cvxmat(G, max_density=0.5)
+        self.assertIsInstance(G_sparse, cvxopt.spmatrix)
+        self.assertTrue(np.allclose(np.array(cvxopt.matrix(G_sparse)), G))
+
+    def test_solve_lp_batch(self):
+        G = np.vstack([np.eye(2), -np.eye(2)])
+        h = np.array([1.0, 2.0, 3.0, 4.0])
+        costs = [np.array([-1.0, -1.0]), np.array([1.0, 2.0])]
+        X = solve_lp_batch(costs, G, h)
+        self.assertEqual(X.shape, (2, 2))
+        for c, x in zip(costs, X):
+            self.assertTrue(np.allclose(x, solve_lp(c, G, h)))
+        X_highs = solve_lp_batch(costs, G, h, solver="highs")
+        self.assertTrue(np.allclose(X_highs, X))
+
+    def test_solve_lp_integer_inputs(self):
+        c = np.array([-1, -1])
+        G = np.vstack([np.eye(2, dtype=int), -np.eye(2, dtype=int)])
+        h = np.array([1, 2, 0, 0])
+        x = solve_lp(c, G, h)
+        self.assertTrue(np.allclose(x, [1.0, 2.0]))
@@ -36,12 +36,25 @@ class TestPolygon(unittest.TestCase):
         with self.assertRaises(ValueError):
             compute_polygon_hull(B, c)
 
+    def test_compute_polygon_hull_redundant(self):
+        B = np.array(
+            [[1.0, 0.0], [0.0, 1.0], [-1.0, 0.0], [0.0, -1.0], [1.0, 1.0]]
+        )
+        c = np.array([1.0, 1.0, 1.0, 1.0, 3.0])
+        x = np.array(compute_polygon_hull(B, c))
+        square = np.array([[1.0, 1.0], [-1.0, 1.0], [-1.0, -1.0], [1.0, -1.0]])
+        self.assertEqual(x.shape, (4, 2))
+        k = np.argmin(np.linalg.norm(square - x[0], axis=1))
+        self.assertTrue(np.allclose(x, np.roll(square, -k, axis=0)))
+
     def test_plot_polygon(self):
-        vertices = [
-            np.array([0.5, 0.5]),
-            np.array([1.5, 0.5]),
-            np.array([1.5, 1.5]),
-            np.array([0.5, 1.5]),
-        ]
+        import matplotlib
+
+        matplotlib.use("Agg")  # render off-screen
+        import matplotlib.pyplot as plt
+
+        self.addCleanup(plt.close, "all")
+        vertices = np.array([[0.5, 0.5], [1.5, 0.5], [1.5, 1.5], [0.5, 1.5]])
         plot_polygon(vertices)
         plot_polygon(vertices, resize=True)
+        plot_polygon(vertices, assume_sorted=True)
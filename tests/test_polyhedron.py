@@ -33,3 +33,10 @@ class TestPolyhedron(unittest.TestCase):
         h = np.array([0.0, -1.0])
         with self.assertRaises(ValueError):
             compute_chebyshev_center(G, h)
+
+    def test_cached_chebyshev_center(self):
+        G = np.array([[1.0, 0.0], [0.0, 1.0], [-1.0, 0.0], [0.0, -1.0]])
+        h = np.array([1.0, 1.0, 0.0, 0.0])
+        x = compute_chebyshev_center(G, h)
+        x[0] = 42.0
+        self.assertTrue(np.allclose(compute_chebyshev_center(G, h), 0.5))
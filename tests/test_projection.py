@@ -8,18 +8,35 @@
 
 import unittest
 
+import cvxopt
 import numpy as np
+from scipy.spatial import ConvexHull
 
 from pypoman import (
+    PolytopeProjector,
     compute_polytope_halfspaces,
     project_point_to_polytope,
+    project_points_to_polytope,
     project_polytope,
 )
+from pypoman.projection import project_polyhedron
 
 
 class TestProjection(unittest.TestCase):
     """Test fixture for projection algorithms."""
 
+    def setUp(self, n: int = 10):
+        """Prepare the projection of a cut box onto its first two axes."""
+        A = np.vstack([+np.eye(n), -np.eye(n)])
+        b = np.ones(2 * n)
+        C = np.ones(n).reshape((1, n))
+        d = np.array([0])
+        E = np.zeros((2, n))
+        E[0, 0] = 1.0
+        E[1, 1] = 1.0
+        f = np.zeros(2)
+        self.box = ((E, f), (A, b), (C, d))
+
     def test_project_polytope(self, n: int = 10, p: int = 2):
         r"""Test polytope projection.
 
@@ -56,12 +73,112 @@ class TestProjection(unittest.TestCase):
         self.assertLess(len(vertices_bretl), 20)
         self.assertLess(len(vertices_cdd), 1000)
 
+    def test_project_polyhedron_rays(self):
+        A = np.array([[1.0, 0.0], [-1.0, 0.0], [0.0, -1.0]])
+        b = np.ones(3)
+        vertices, rays = project_polyhedron((np.eye(2), np.ones(2)), (A, b))
+        vertices = sorted(map(tuple, vertices))
+        self.assertTrue(np.allclose(vertices, [[0.0, 0.0], [2.0, 0.0]]))
+        self.assertEqual(len(rays), 1)
+        self.assertTrue(np.allclose(rays[0] / rays[0][1], [0.0, 1.0]))
+
+    def test_project_polyhedron_missing_d(self):
+        A, b = np.vstack([np.eye(2), -np.eye(2)]), np.ones(4)
+        with self.assertRaises(ValueError):
+            project_polyhedron((np.eye(2), np.zeros(2)), (A, b), (A[:1], None))
+
+    def test_project_polyhedron_cached(self):
+        A = np.vstack([np.eye(3), -np.eye(3)])
+        b = np.ones(6)
+        E1, E2 = np.eye(3)[:2], np.eye(3)[1:]
+        f = np.zeros(2)
+        for E in (E1, E2, E1):
+            vertices, rays = project_polyhedron((E, f), (A, b))
+            self.assertEqual(len(vertices), 8)
+            self.assertEqual(len(rays), 0)
+            vertices = np.unique(np.array(vertices), axis=0)
+            self.assertEqual(vertices.shape, (4, 2))
+            self.assertTrue(np.allclose(np.abs(vertices), 1.0))
+
+    def test_project_polyhedron_remove_redundant(self):
+        A = np.vstack([np.eye(3), -np.eye(3), [[1.0, 1.0, 0.0]]])
+        b = np.array([1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 2.0])  # last is redundant
+        E, f = np.eye(3)[:2], np.zeros(2)
+        vertices, _ = project_polyhedron((E, f), (A, b))
+        reduced, _ = project_polyhedron((E, f), (A, b), remove_redundant=True)
+        self.assertEqual(len(reduced), 8)
+        self.assertTrue(
+            np.allclose(
+                sorted(map(tuple, reduced)), sorted(map(tuple, vertices))
+            )
+        )
+
+    def test_polytope_projector(self):
+        projector = PolytopeProjector(*self.box)
+        first = projector.project(init_angle=0.0)
+        second = projector.project(init_angle=0.0)
+        self.assertGreater(len(first), 3)
+        self.assertEqual(len(first), len(second))
+        for v1, v2 in zip(first, second):
+            self.assertTrue(np.allclose(v1, v2))
+
+    def test_polytope_projector_sparse(self):
+        dense = PolytopeProjector(*self.box)
+        sparse = PolytopeProjector(*self.box, max_density=0.5)
+        self.assertIsInstance(sparse.optimizer.lp[1], cvxopt.spmatrix)
+        first = dense.project(init_angle=0.0)
+        second = sparse.project(init_angle=0.0)
+        self.assertEqual(len(first), len(second))
+        for v1, v2 in zip(first, second):
+            self.assertTrue(np.allclose(v1, v2))
+
+    def test_polytope_projector_highs(self):
+        glpk = PolytopeProjector(*self.box)
+        highs = PolytopeProjector(*self.box, solver="highs")
+        highs.update_vectors(b=self.box[1][1])
+        first = np.array(glpk.project(init_angle=0.0))
+        second = np.array(highs.project(init_angle=0.0))
+        # solvers may return different optima on degenerate edges
+        first = first[ConvexHull(first).vertices]
+        second = second[ConvexHull(second).vertices]
+        self.assertEqual(len(first), len(second))
+        k = np.argmin(np.linalg.norm(second - first[0], axis=1))
+        self.assertTrue(np.allclose(np.roll(second, -k, axis=0), first))
+
+    def test_polytope_projector_update_vectors(self, n: int = 6):
+        A = np.vstack([+np.eye(n), -np.eye(n)])
+        C = np.ones(n).reshape((1, n))
+        E = np.zeros((2, n))
+        E[0, 0] = 1.0
+        E[1, 1] = 1.0
+        projector = PolytopeProjector(
+            (E, np.zeros(2)), (A, np.ones(2 * n)), (C, np.array([0.0]))
+        )
+        b, d, f = 2.0 * np.ones(2 * n), np.array([1.0]), np.array([0.5, 0.0])
+        projector.update_vectors(b=b, d=d, f=f)
+        updated = projector.project(init_angle=0.0)
+        rebuilt = PolytopeProjector((E, f), (A, b), (C, d))
+        expected = rebuilt.project(init_angle=0.0)
+        self.assertEqual(len(updated), len(expected))
+        for v1, v2 in zip(updated, expected):
+            self.assertTrue(np.allclose(v1, v2))
+
     def test_project_point_to_polytope(self):
-        vertices = [
-            (np.cos(theta), np.sin(theta))
-            for theta in np.arange(0, 2 * np.pi, np.pi / 6)
-        ]
+        thetas = np.arange(0, 2 * np.pi, np.pi / 6)
+        vertices = np.column_stack([np.cos(thetas), np.sin(thetas)])
         A, b = compute_polytope_halfspaces(vertices)
         point = np.array([2.1, 1.9])
         proj = project_point_to_polytope(point, (A, b), qpsolver="cvxopt")
         self.assertEqual(proj.shape, (2,))
+
+    def test_project_points_to_polytope(self):
+        A = np.vstack([np.eye(2), -np.eye(2)])
+        b = np.ones(4)
+        points = np.array([[2.0, 0.5], [0.2, -0.3], [-3.0, -3.0]])
+        proj = project_points_to_polytope(points, (A, b), qpsolver="cvxopt")
+        expected = np.array([[1.0, 0.5], [0.2, -0.3], [-1.0, -1.0]])
+        self.assertEqual(proj.shape, (3, 2))
+        self.assertTrue(np.allclose(proj, expected, atol=1e-5))
+        for point, x in zip(points, proj):
+            y = project_point_to_polytope(point, (A, b), qpsolver="cvxopt")
+            self.assertTrue(np.allclose(x, y, atol=1e-5))